@@ -11,37 +11,87 @@ import json
 import subprocess
 import os
 import sys
-import re
 import time
+import socket
+import string
+import threading
+import http.client
 from datetime import datetime
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from urllib.parse import quote
+
+try:
+    import orjson
+except ImportError:  # optional - stdlib json works, just slower on big dumps
+    orjson = None
+
+# Shared with the post-mortem analyzer so both agree on what a vote is
+from triage_analyze import parse_results_lines, score_response, score_unparsed, weighted_scope_consensus
+
+GITHUB_API_HOST = 'api.github.com'
+
+COMMENT_TEMPLATE = string.Template('''## 🐱 Catfight Triage Results ($hostname)
+
+This issue was analyzed by the clood model gauntlet running on **$hostname**.
+
+**Models ($model_count cats):**
+```
+$models
+```
+$consensus_line
+<details>
+<summary>Click to expand full analysis</summary>
+
+```
+$results
+```
+
+</details>
+
+---
+*Automated triage by clood catfight on $hostname - $timestamp*
+''')
 
 def log(msg):
     print(f'[{datetime.now().strftime("%H:%M:%S")}] {msg}', flush=True)
 
 def check_ollama():
-    """Health check - make sure ollama is responding"""
+    """Health check - make sure ollama is responding (raw socket, no curl fork)"""
     try:
-        result = subprocess.run(['curl', '-s', 'http://localhost:11434/api/tags'],
-                              capture_output=True, timeout=10)
-        return result.returncode == 0
-    except:
+        with socket.create_connection(('localhost', 11434), timeout=2) as sock:
+            sock.sendall(b'GET /api/tags HTTP/1.0\r\nHost: localhost\r\n\r\n')
+            return sock.recv(12).startswith(b'HTTP/1.')
+    except OSError:
         return False
 
+def load_issues(issues_file):
+    """Load the GitHub issues dump, parsing raw bytes with orjson when available"""
+    with open(issues_file, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if orjson else json.loads(data)
+
 def get_issue_labels(issue):
-    """Extract label names from issue data"""
-    return [l['name'] for l in issue.get('labels', [])]
+    """Extract label names from issue data (as a set - only membership is checked)"""
+    return frozenset(l['name'] for l in issue.get('labels', ()))
 
 def should_process(issue, hostname_tag):
     """Determine if issue should be processed based on labels"""
-    labels = get_issue_labels(issue)
+    return label_decision(get_issue_labels(issue), hostname_tag)
+
+@lru_cache(maxsize=256)
+def label_decision(labels, hostname_tag):
+    """should_process's verdict for a label set; cached since most issues share a few sets"""
+    if 'needs-retriage' in labels:
+        return True, "ready to process"
 
     # Skip if already triaged by this machine (unless needs-retriage)
-    if hostname_tag in labels and 'needs-retriage' not in labels:
+    if hostname_tag in labels:
         return False, "already triaged by this machine"
 
     # Skip if fully triaged (has generic 'triaged' label) unless needs-retriage
-    if 'triaged' in labels and 'needs-retriage' not in labels:
+    if 'triaged' in labels:
         return False, "already triaged"
 
     # Skip if marked as triage-failed (needs manual intervention)
@@ -51,92 +101,214 @@ def should_process(issue, hostname_tag):
 
     return True, "ready to process"
 
-def extract_size_estimates(results_text):
-    """Parse size estimates from model outputs
-
-    Looks for patterns like:
-    - **Size:** XS
-    - **Size:** S
-    - Size: M
-    """
-    sizes = []
-    # Match various formats models might use
-    patterns = [
-        r'\*\*Size:\*\*\s*(XS|S|M|L|XL)',
-        r'Size:\s*(XS|S|M|L|XL)',
-        r'\bSize\b[:\s]*(XS|S|M|L|XL)',
-    ]
-
-    for pattern in patterns:
-        matches = re.findall(pattern, results_text, re.IGNORECASE)
-        sizes.extend([s.upper() for s in matches])
-
-    return sizes
-
-def extract_open_questions(results_text):
-    """Check if models identified open questions or unclear requirements"""
-    indicators = [
-        'open question',
-        'unclear',
-        'need more information',
-        'needs clarification',
-        'ambiguous',
-        'not specified',
-        'missing requirement',
-    ]
-
-    text_lower = results_text.lower()
-    return any(ind in text_lower for ind in indicators)
-
 def analyze_results(results_text):
     """Analyze catfight results and determine labels to add
 
+    Each model response is scored once (size vote, confidence, open
+    questions) and the sizes are combined as a confidence-weighted vote.
+
     Returns: (labels, consensus_summary)
     """
     labels = []
     consensus_summary = ""
 
-    # Extract and analyze size estimates
-    sizes = extract_size_estimates(results_text)
-    if sizes:
-        size_counts = Counter(sizes)
-        most_common_size, most_common_count = size_counts.most_common(1)[0]
-        total_sizes = len(sizes)
+    responses = parse_results_lines(results_text.splitlines())["responses"]
+    if responses:
+        scores = [score_response(r) for r in responses.values()]
+    else:
+        # Layout we don't recognise - score the whole text rather than label nothing
+        scores = score_unparsed(results_text)
+
+    top_size, votes, share = weighted_scope_consensus(scores)
+    if top_size:
+        total_votes = sum(votes.values())
 
-        # Build consensus summary
-        consensus_summary = f"{most_common_count}/{total_sizes} models agree: Size {most_common_size}"
+        # Report the confidence-weighted share - it's what decides the label
+        consensus_summary = (f"{share:.0%} of weighted votes agree: Size {top_size} "
+                             f"({votes[top_size]}/{total_votes} models)")
 
-        # If majority (>50%) agree on a size, use that
-        if most_common_count > total_sizes / 2:
-            labels.append(f'scope:{most_common_size}')
+        # If a weighted majority (>50%) agrees on a size, use that
+        if share > 0.5:
+            labels.append(f'scope:{top_size}')
         else:
             labels.append('scope-disputed')
-            consensus_summary = f"⚠️ DISPUTED - {size_counts.most_common()}"
+            consensus_summary = (f"⚠️ DISPUTED - top Size {top_size} has {share:.0%} of weighted votes "
+                                 f"- {Counter(votes).most_common()}")
 
     # Check for open questions
-    if extract_open_questions(results_text):
+    if any(score['open_questions'] for score in scores):
         labels.append('needs-clarification')
     else:
         labels.append('actionable')
 
     return labels, consensus_summary
 
-def add_labels(issue_num, labels, repo):
-    """Add labels to a GitHub issue"""
-    for label in labels:
-        cmd = f'gh issue edit {issue_num} --repo {repo} --add-label "{label}"'
+def run_catfight(cmd, result_file, timeout):
+    """Run catfight, teeing its output to result_file as it arrives
+
+    Returns the output text from memory so the file never has to be re-read.
+    Raises subprocess.TimeoutExpired if it runs longer than `timeout` seconds.
+    """
+    chunks = []
+    timed_out = threading.Event()
+
+    with open(result_file, 'wb') as out, \
+            subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT) as proc:
+        def kill():
+            timed_out.set()
+            proc.kill()
+
+        watchdog = threading.Timer(timeout, kill)
+        watchdog.start()
         try:
-            subprocess.run(cmd, shell=True, capture_output=True, timeout=30)
-        except Exception as e:
-            log(f'    ⚠ Failed to add label {label}: {e}')
+            for chunk in iter(lambda: proc.stdout.read1(65536), b''):
+                out.write(chunk)
+                chunks.append(chunk)
+            proc.wait()
+        finally:
+            watchdog.cancel()
+
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    return b''.join(chunks).decode('utf-8', errors='replace')
+
+def get_github_token():
+    """Fetch a GitHub token once (env first, then gh's stored credentials)"""
+    token = os.environ.get('GH_TOKEN') or os.environ.get('GITHUB_TOKEN')
+    if token:
+        return token
+    return subprocess.check_output(['gh', 'auth', 'token'], text=True, timeout=30).strip()
+
+class GitHubClient:
+    """Keep-alive GitHub REST client - one TLS session for the whole run
+
+    Pacing is driven by GitHub's rate-limit headers instead of a fixed sleep:
+    writes are spaced MIN_WRITE_INTERVAL apart (GitHub's guidance for content
+    creation), and we only back off when X-RateLimit-Remaining runs low or
+    GitHub answers 403/429.
+    """
+
+    RATE_LIMIT_FLOOR = 100     # start spreading requests out below this many left
+    MIN_WRITE_INTERVAL = 1.0   # seconds between mutating requests
+
+    def __init__(self, token):
+        self.headers = {
+            'Authorization': f'Bearer {token}',
+            'Accept': 'application/vnd.github+json',
+            'User-Agent': 'clood-catfight-triage',
+        }
+        self.conn = None
+        self.last_write = 0.0
+
+    def request(self, method, path, payload=None):
+        """Send a request, throttling and retrying once if GitHub rate-limits us
+
+        Returns the response; raises RuntimeError on HTTP errors.
+        """
+        body = json.dumps(payload).encode() if payload is not None else None
+        headers = dict(self.headers)
+        if body is not None:
+            headers['Content-Type'] = 'application/json'
+
+        if method != 'GET':
+            wait = self.last_write + self.MIN_WRITE_INTERVAL - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self.last_write = time.monotonic()
+
+        resp, data = self._send(method, path, body, headers)
+        if resp.status in (403, 429) and self.throttle(resp):
+            resp, data = self._send(method, path, body, headers)
+
+        if resp.status >= 400:
+            raise RuntimeError(f'{method} {path} -> {resp.status}: {data[:200]!r}')
+        self.throttle(resp)
+        return resp
+
+    def _send(self, method, path, body, headers):
+        """One round trip, reconnecting once if the kept-alive socket dropped"""
+        for attempt in range(2):
+            if self.conn is None:
+                self.conn = http.client.HTTPSConnection(GITHUB_API_HOST, timeout=30)
+            try:
+                self.conn.request(method, path, body=body, headers=headers)
+                resp = self.conn.getresponse()
+                return resp, resp.read()
+            except (http.client.HTTPException, OSError):
+                self.conn.close()
+                self.conn = None
+                if attempt:
+                    raise
+
+    def throttle(self, resp):
+        """Sleep only if the response says we're near (or over) the rate limit
+
+        Returns True if it slept.
+        """
+        retry_after = resp.getheader('Retry-After')
+        if retry_after:
+            wait = float(retry_after)
+        else:
+            remaining = resp.getheader('X-RateLimit-Remaining')
+            reset = resp.getheader('X-RateLimit-Reset')
+            if remaining is None or reset is None or int(remaining) >= self.RATE_LIMIT_FLOOR:
+                return False
+            # Spread what's left of the budget evenly until the window resets
+            wait = max(0.0, int(reset) - time.time()) / max(int(remaining), 1)
+
+        log(f'    💤 GitHub rate limit - sleeping {wait:.0f}s')
+        time.sleep(wait)
+        return True
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+def edit_labels(gh, issue_num, repo, add=(), remove=(), existing=None):
+    """Add and remove labels on a GitHub issue over the shared connection
+
+    If the issue's current labels are passed as `existing`, labels it
+    already has aren't re-added and labels it lacks aren't removed, so
+    no-op mutations never reach GitHub.
+    """
+    if existing is not None:
+        add = [label for label in add if label not in existing]
+        remove = [label for label in remove if label in existing]
+
+    try:
+        if add:
+            gh.request('POST', f'/repos/{repo}/issues/{issue_num}/labels', {'labels': list(add)})
+        for label in remove:
+            gh.request('DELETE', f'/repos/{repo}/issues/{issue_num}/labels/{quote(label, safe="")}')
+    except Exception as e:
+        log(f'    ⚠ Failed to update labels {list(add) + list(remove)}: {e}')
+
+def add_labels(gh, issue_num, labels, repo, existing=None):
+    """Add labels to a GitHub issue"""
+    edit_labels(gh, issue_num, repo, add=labels, existing=existing)
 
-def remove_label(issue_num, label, repo):
-    """Remove a label from a GitHub issue"""
-    cmd = f'gh issue edit {issue_num} --repo {repo} --remove-label "{label}"'
+def post_comment(gh, issue_num, comment, repo):
+    """Post a comment on a GitHub issue"""
+    gh.request('POST', f'/repos/{repo}/issues/{issue_num}/comments', {'body': comment})
+
+def publish_results(gh, issue_num, repo, comment, add, remove=(), existing=None):
+    """Post the triage comment and labels for one issue (poster thread)
+
+    Returns True on success. Runs while the next catfight is already going;
+    GitHubClient paces the writes themselves.
+    """
     try:
-        subprocess.run(cmd, shell=True, capture_output=True, timeout=30)
-    except:
-        pass  # Label might not exist, that's fine
+        post_comment(gh, issue_num, comment, repo)
+        log(f'  ✓ Comment posted to Issue #{issue_num}')
+
+        edit_labels(gh, issue_num, repo, add=add, remove=remove, existing=existing)
+        log(f'  ✓ Labels updated on Issue #{issue_num}')
+        return True
+    except Exception as e:
+        log(f'  ✗ Failed to post results for Issue #{issue_num}: {e}')
+        add_labels(gh, issue_num, ['triage-failed'], repo, existing=existing)
+        return False
 
 def main():
     # Configuration from environment or defaults
@@ -146,6 +318,7 @@ def main():
     repo = os.environ.get('REPO', 'dirtybirdnj/clood')
     hostname = os.environ.get('HOSTNAME', 'unknown')
     clood_path = os.environ.get('CLOOD_PATH', './clood')
+    archive_comments = os.environ.get('ARCHIVE_COMMENTS', '') not in ('', '0')
 
     # Determine hostname tag for labels
     hostname_lower = hostname.lower()
@@ -158,9 +331,11 @@ def main():
 
     log(f'Hostname tag: {hostname_tag}')
 
+    # One authenticated connection for every GitHub call in this run
+    gh = GitHubClient(get_github_token())
+
     # Read issues
-    with open(issues_file, 'r') as f:
-        issues = json.load(f)
+    issues = load_issues(issues_file)
 
     prompt_template = '''You are analyzing GitHub Issue #{number} from the clood project (a CLI tool for orchestrating local LLM inference across a server garden).
 
@@ -204,24 +379,33 @@ Format your response EXACTLY like this:
 *Generated by clood catfight triage*
 '''
 
+    # Comment fields that don't change between issues
+    comment_fields = {
+        'hostname': hostname,
+        'model_count': len(models.split(',')),
+        'models': models,
+    }
+
     processed = 0
-    skipped = 0
     failed = 0
 
-    for i, issue in enumerate(issues):
+    # All GitHub writes go through one poster thread (the connection isn't
+    # thread-safe) so they overlap with the next issue's catfight
+    poster = ThreadPoolExecutor(max_workers=1)
+    postings = []
+
+    # Filter up front so already-triaged issues never enter the loop
+    todo = [issue for issue in issues if should_process(issue, hostname_tag)[0]]
+    skipped = len(issues) - len(todo)
+    log(f'{len(todo)}/{len(issues)} issues ready ({skipped} already triaged)')
+
+    for i, issue in enumerate(todo):
         num = issue['number']
         title = issue['title']
         body = issue['body'] or 'No description provided.'
         labels = get_issue_labels(issue)
 
-        log(f'\n[{i+1}/{len(issues)}] Issue #{num}: {title[:50]}...')
-
-        # Check if we should process this issue
-        should, reason = should_process(issue, hostname_tag)
-        if not should:
-            log(f'  ⏭ Skipping - {reason}')
-            skipped += 1
-            continue
+        log(f'\n[{i+1}/{len(todo)}] Issue #{num}: {title[:50]}...')
 
         # De-icing: Check ollama is alive before each issue
         if not check_ollama():
@@ -229,7 +413,7 @@ Format your response EXACTLY like this:
             time.sleep(30)
             if not check_ollama():
                 log('  ✗ Ollama still down, skipping issue')
-                add_labels(num, ['triage-failed'], repo)
+                poster.submit(add_labels, gh, num, ['triage-failed'], repo, existing=labels)
                 failed += 1
                 continue
 
@@ -247,16 +431,11 @@ Format your response EXACTLY like this:
 
         # Run catfight
         result_file = f'{log_dir}/issue-{num}-results.txt'
-        cmd = f'{clood_path} catfight -m "{models}" -f "{prompt_file}" > "{result_file}" 2>&1'
+        cmd = [clood_path, 'catfight', '-m', models, '-f', prompt_file]
 
         try:
-            subprocess.run(cmd, shell=True, timeout=1800)  # 30 min timeout
+            results = run_catfight(cmd, result_file, timeout=1800)  # 30 min timeout
             log('  ✓ Catfight complete')
-
-            # Read results
-            with open(result_file, 'r') as f:
-                results = f.read()
-
             log(f'  ✓ Results saved to {result_file}')
 
             # Analyze results and determine labels
@@ -272,66 +451,47 @@ Format your response EXACTLY like this:
             if len(results) > max_len:
                 results = results[-max_len:]
 
-            model_count = len(models.split(','))
-
             # Build consensus line
             consensus_line = f"\n**📊 Consensus:** {consensus_summary}\n" if consensus_summary else ""
 
             # Build comment
-            comment = f'''## 🐱 Catfight Triage Results ({hostname})
-
-This issue was analyzed by the clood model gauntlet running on **{hostname}**.
-
-**Models ({model_count} cats):**
-```
-{models}
-```
-{consensus_line}
-<details>
-<summary>Click to expand full analysis</summary>
-
-```
-{results}
-```
-
-</details>
-
----
-*Automated triage by clood catfight on {hostname} - {datetime.now().strftime("%Y-%m-%d %H:%M")}*
-'''
-
-            # Post to GitHub
-            comment_file = f'{log_dir}/issue-{num}-comment.md'
-            with open(comment_file, 'w') as f:
-                f.write(comment)
-
-            post_cmd = f'gh issue comment {num} --repo {repo} --body-file "{comment_file}"'
-            subprocess.run(post_cmd, shell=True)
-            log(f'  ✓ Comment posted to Issue #{num}')
-
-            # Add labels
-            add_labels(num, result_labels, repo)
-
-            # Remove needs-retriage if it was set
-            if 'needs-retriage' in labels:
-                remove_label(num, 'needs-retriage', repo)
-
-            log(f'  ✓ Labels updated')
-            processed += 1
-
-            # De-icing: Sleep between issues to avoid GitHub rate limiting
-            log('  💤 Sleeping 10s before next issue...')
-            time.sleep(10)
+            comment = COMMENT_TEMPLATE.substitute(
+                comment_fields,
+                consensus_line=consensus_line,
+                results=results,
+                timestamp=datetime.now().strftime("%Y-%m-%d %H:%M"),
+            )
+
+            # The comment goes straight into the API request body; only keep
+            # a copy on disk when asked to (debugging)
+            if archive_comments:
+                with open(f'{log_dir}/issue-{num}-comment.md', 'w') as f:
+                    f.write(comment)
+
+            # Hand off to the poster thread and move on to the next issue
+            postings.append(poster.submit(
+                publish_results, gh, num, repo, comment, result_labels,
+                remove=['needs-retriage'], existing=labels))
 
         except subprocess.TimeoutExpired:
             log(f'  ✗ Timeout on Issue #{num} (30 min exceeded)')
-            add_labels(num, ['triage-failed'], repo)
+            poster.submit(add_labels, gh, num, ['triage-failed'], repo, existing=labels)
             failed += 1
         except Exception as e:
             log(f'  ✗ Error on Issue #{num}: {e}')
-            add_labels(num, ['triage-failed'], repo)
+            poster.submit(add_labels, gh, num, ['triage-failed'], repo, existing=labels)
             failed += 1
 
+    # Drain pending GitHub writes before reporting
+    poster.shutdown(wait=True)
+    for posting in postings:
+        if posting.result():
+            processed += 1
+        else:
+            failed += 1
+
+    gh.close()
+
     print('\n' + '='*50)
     print(f'🏁 CATFIGHT TRIAGE COMPLETE - {hostname}')
     print('='*50)
@@ -0,0 +1,135 @@
+"""Tests for the catfight output parser and scope vote shared by the triage scripts
+
+Fixtures follow the exact Printf layouts in internal/commands/catfight.go.
+"""
+
+from issue_catfight_processor import analyze_results
+from triage_analyze import extract_scope_from_response, parse_results_lines, score_response
+
+SINGLE_HOST = """\
+>>> [1/3] Persian (qwen2.5-coder:7b)
+    DONE 12.3s | 410 tokens | 33.3 tok/s
+>>> [2/3] Tabby (llama3.1:8b)
+    DONE 20.0s | 512 tokens | 25.6 tok/s
+>>> [3/3] Siamese (qwen2.5-coder:3b)
+    ERROR: context deadline exceeded
+
+RESULTS
+
+CAT          MODEL                         TIME   TOKENS      TOK/S
+----------------------------------------------------------------------
+Persian      qwen2.5-coder:7b             12.3s      410       33.3
+Tabby        llama3.1:8b                  20.0s      512       25.6
+Siamese      qwen2.5-coder:3b          FAILED
+
+WINNER: Persian wins with 12.3s!
+
+RESPONSES
+
+### Persian (qwen2.5-coder:7b)
+------------------------------------------------------------
+## Scope Estimate
+**Size:** M
+
+### Plan
+1. Add the flag
+
+### Tabby (llama3.1:8b)
+------------------------------------------------------------
+Size: M
+The retry behaviour is unclear from the issue.
+
+### Siamese (qwen2.5-coder:3b)
+------------------------------------------------------------
+ERROR: context deadline exceeded
+
+"""
+
+MULTI_HOST = """\
+🍳 Kitchen: mac-mini (http://mac-mini:11434)
+--------------------------------------------------
+>>> [1/2] Persian (qwen2.5-coder:7b) on mac-mini
+    DONE 12.3s | 410 tokens | 33.3 tok/s
+
+🍳 Kitchen: ubuntu25 (http://ubuntu25:11434)
+--------------------------------------------------
+>>> [2/2] Persian (qwen2.5-coder:7b) on ubuntu25
+    DONE 8.1s | 388 tokens | 47.9 tok/s
+
+WINNER: Persian on ubuntu25 wins with 8.1s!
+
+RESPONSES
+
+### Persian (qwen2.5-coder:7b) on mac-mini
+------------------------------------------------------------
+**Size:** S
+
+### Persian (qwen2.5-coder:7b) on ubuntu25
+------------------------------------------------------------
+**Size:** S
+
+"""
+
+
+def test_single_host_parse():
+    results = parse_results_lines(SINGLE_HOST.splitlines())
+    assert results["winner"] == {"name": "Persian", "time": 12.3}
+    assert [m["status"] for m in results["models"]] == ["done", "done", "failed"]
+    assert list(results["responses"]) == ["qwen2.5-coder:7b", "llama3.1:8b", "qwen2.5-coder:3b"]
+    # markdown headings inside a response stay part of it
+    assert "### Plan" in results["responses"]["qwen2.5-coder:7b"]
+
+
+def test_single_host_labels():
+    labels, summary = analyze_results(SINGLE_HOST)
+    assert labels == ["scope:M", "needs-clarification"]
+    assert summary.startswith("100% of weighted votes agree: Size M (2/2 models)")
+
+
+def test_multi_host_parse():
+    results = parse_results_lines(MULTI_HOST.splitlines())
+    assert results["winner"] == {"name": "Persian", "time": 8.1}
+    assert len(results["models"]) == 2
+    # the same model on two hosts is two responses, not one overwritten
+    assert list(results["responses"]) == ["qwen2.5-coder:7b@mac-mini", "qwen2.5-coder:7b@ubuntu25"]
+
+
+def test_multi_host_labels():
+    labels, _ = analyze_results(MULTI_HOST)
+    assert labels == ["scope:S", "actionable"]
+
+
+def test_unparsed_output_falls_back_to_whole_text():
+    labels, _ = analyze_results("Size: L\nSize: L\nScope: S\n")
+    assert labels == ["scope:L", "actionable"]
+
+
+def test_scope_markers_in_any_case():
+    assert extract_scope_from_response("SiZe: m") == "M"
+    assert extract_scope_from_response("**sCOPE estimate:** xl") == "XL"
+    assert extract_scope_from_response("no estimate here") is None
+
+
+def test_confidence_formats():
+    for text, expected in [
+        ("Size: M\nConfidence: 0.8", 0.8),
+        ("Size: M\nConfidence: 80%", 0.8),
+        ("Size: M\nConfidence: 8/10", 0.8),
+        ("Size: M\n**Confidence:** 4 / 5", 0.8),
+        ("Size: M\nConfidence: 85", 0.85),
+        ("Size: M", 1.0),
+    ]:
+        assert score_response(text)["confidence"] == expected, text
+
+
+def test_summary_reports_weighted_share():
+    # Two confident M votes outweigh three unsure S votes, so the label and
+    # the summary must both follow the weights, not the raw counts
+    responses = [("M", "9/10"), ("M", "9/10"), ("S", "2/10"), ("S", "2/10"), ("S", "2/10")]
+    text = "".join(
+        f"### Cat{i} (model-{i})\n{'-' * 60}\nSize: {size}\nConfidence: {conf}\n\n"
+        for i, (size, conf) in enumerate(responses)
+    )
+    labels, summary = analyze_results(text)
+    assert labels[0] == "scope:M"
+    assert summary.startswith("75% of weighted votes agree: Size M (2/5 models)")
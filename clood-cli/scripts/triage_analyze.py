@@ -9,115 +9,339 @@ import json
 import os
 import re
 import sys
-from collections import defaultdict
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+try:
+    import orjson
+except ImportError:  # optional - stdlib json works, just slower on big runs
+    orjson = None
+
 # Import from logger module
 from triage_logger import (
     JSONL_DIR, RAW_DIR, list_runs, load_run_summary,
     get_model_benchmarks, ensure_dirs
 )
 
+# Below this many results files the process pool costs more than it saves
+PARALLEL_MIN_FILES = 8
+
+# Parsed results are cached next to the run; bump when the parser output changes
+# (triage_report keys its own cache on this too)
+ANALYSIS_CACHE_NAME = ".analysis-cache.json"
+ANALYSIS_CACHE_VERSION = 2
+
+# Compiled once - these run over every results file / model response
+# One tokenizer for catfight output lines; the group that matched names the token.
+# Multi-host runs append " on <host>" to the response header and winner line.
+LINE_TOKEN_RE = re.compile(
+    r'(?P<response>### (?P<resp_name>\S+) \((?P<resp_model>[^)]+)\)(?: on (?P<resp_host>\S+))?$)'
+    r'|(?P<header>>>> \[\d+/\d+\] (?P<name>\S+) \((?P<model>[^)]+)\))'
+    r'|(?P<winner>WINNER: (?P<winner_name>\S+)(?: on \S+)? wins with (?P<winner_time>[\d.]+)s)'
+    r'|\s*(?P<status>DONE (?P<time>\d+\.?\d*)s \| (?P<tokens>\d+) tokens \| (?P<toks>\d+\.?\d*) tok/s'
+    r'|FAILED|ERROR)'
+)
+ISSUE_NUM_RE = re.compile(r'issue-(\d+)-results')
+SCOPE_RE = re.compile(r'(?:\*\*(?:Size|Scope[^:]*):\*\*|Size:|Scope:)\s*(XS|S|M|L|XL)', re.IGNORECASE)
+# Every scope marker contains one of these once casefolded (the regex ignores case too)
+SCOPE_HINTS = ("size", "scope")
+
+OPEN_QUESTION_INDICATORS = (
+    'open question',
+    'unclear',
+    'need more information',
+    'needs clarification',
+    'ambiguous',
+    'not specified',
+    'missing requirement',
+)
+
+# Everything score_response looks for, so a response is walked exactly once
+RESPONSE_SIGNAL_RE = re.compile(
+    r'(?:\*\*(?:Size|Scope[^:]*):\*\*|Size:|Scope:)\s*(?P<size>XS|S|M|L|XL)'
+    r'|\bconfidence\W{0,4}(?P<confidence>\d{1,3}(?:\.\d+)?%?|\.\d+)(?:\s*/\s*(?P<scale>\d{1,3}))?'
+    r'|(?P<question>' + '|'.join(map(re.escape, OPEN_QUESTION_INDICATORS)) + ')',
+    re.IGNORECASE
+)
+
 
 def parse_results_file(filepath: Path) -> Dict:
     """Parse a catfight results file into structured data"""
     with open(filepath) as f:
-        content = f.read()
+        return parse_results_lines(f)
+
+
+def tokenize_results(lines):
+    """Lex catfight output into (kind, match, line) tokens
+
+    kind is "response", "header", "winner", "status" or "text"; each line
+    costs a single LINE_TOKEN_RE match.
+    """
+    for line in lines:
+        line = line.rstrip("\n")
+        match = LINE_TOKEN_RE.match(line)
+        yield (match.lastgroup if match else "text"), match, line
 
+
+def parse_results_lines(lines) -> Dict:
+    """Parse catfight output (any iterable of lines) into structured data
+
+    Single pass over tokenize_results: ">>> [i/n]" headers wait for their
+    DONE/FAILED status line, "WINNER:" sets the winner, and each
+    "### name (model)" header starts a new response body that runs until
+    the next response header (so markdown "### " headings inside a response
+    stay part of it). Responses are keyed by model, or "model@host" when the
+    header names a host, so one model run on two hosts still casts two votes.
+    """
     result = {
         "models": [],
         "winner": None,
         "responses": {}
     }
 
-    # Extract model results
-    pattern = r'>>> \[(\d+)/(\d+)\] (\S+) \(([^)]+)\)\s+(?:DONE (\d+\.?\d*)s \| (\d+) tokens \| (\d+\.?\d*) tok/s|(FAILED|ERROR)[^\n]*)'
+    pending = None       # model header still waiting for its status line
+    current = None       # model whose response body is being collected
+    body: List[str] = []
+
+    for kind, match, line in tokenize_results(lines):
+        if kind == "response":
+            if current is not None:
+                result["responses"][current] = "\n".join(body).strip()
+            pending = None
+            current = match.group("resp_model")
+            if match.group("resp_host"):
+                current += "@" + match.group("resp_host")
+            body = []
+
+        elif current is not None:
+            # Skip the dashed rule under each response header
+            if body or line.strip("-"):
+                body.append(line)
+
+        elif kind == "header":
+            pending = {"name": match.group("name"), "model": match.group("model")}
+
+        elif kind == "winner":
+            result["winner"] = {"name": match.group("winner_name"),
+                                "time": float(match.group("winner_time"))}
+
+        elif kind == "status" and pending is not None:
+            time = match.group("time")
+            pending["status"] = "done" if time else "failed"
+            if time:
+                pending["time"] = float(time)
+                pending["tokens"] = int(match.group("tokens"))
+                pending["toks"] = float(match.group("toks"))
+            result["models"].append(pending)
+            pending = None
+
+    if current is not None:
+        result["responses"][current] = "\n".join(body).strip()
 
-    for match in re.finditer(pattern, content):
-        idx, total, name, model, time, tokens, toks, error = match.groups()
+    return result
 
-        model_result = {
-            "name": name,
-            "model": model,
-            "status": "done" if time else "failed"
-        }
 
-        if time:
-            model_result["time"] = float(time)
-            model_result["tokens"] = int(tokens)
-            model_result["toks"] = float(toks)
+def extract_scope_from_response(response: str) -> Optional[str]:
+    """Extract scope estimate from a model response"""
+    # Most responses carry no scope at all; substring checks reject those far faster than the regex
+    folded = response.casefold()
+    if not any(hint in folded for hint in SCOPE_HINTS):
+        return None
+    match = SCOPE_RE.search(response)
+    return match.group(1).upper() if match else None
+
+
+def score_response(response: str) -> Dict:
+    """Score one model response in a single regex pass
+
+    Returns {"size", "confidence", "open_questions"}. The first Size/Scope
+    marker is the model's vote; a stated confidence (0.8, 80%, 8/10) weights
+    it, defaulting to 1.0 so unweighted responses count as plain votes.
+    """
+    size = None
+    confidence = None
+    open_questions = False
+
+    for match in RESPONSE_SIGNAL_RE.finditer(response):
+        if match.group("size"):
+            if size is None:
+                size = match.group("size").upper()
+        elif match.group("confidence"):
+            if confidence is None:
+                raw = match.group("confidence")
+                scale = match.group("scale")
+                value = float(raw.rstrip("%"))
+                if scale and int(scale):
+                    value /= int(scale)
+                elif raw.endswith("%") or value > 1:
+                    value /= 100
+                confidence = min(max(value, 0.0), 1.0)
+        else:
+            open_questions = True
 
-        result["models"].append(model_result)
+        if size and confidence is not None and open_questions:
+            break
 
-    # Find winner
-    winner_match = re.search(r'WINNER: (\S+) wins with ([\d.]+)s', content)
-    if winner_match:
-        result["winner"] = {"name": winner_match.group(1), "time": float(winner_match.group(2))}
+    return {
+        "size": size,
+        "confidence": 1.0 if confidence is None else confidence,
+        "open_questions": open_questions
+    }
 
-    # Extract responses (between ### ModelName and next ### or end)
-    response_pattern = r'### (\S+) \(([^)]+)\)\n-+\n(.*?)(?=\n### |\n$|\Z)'
-    for match in re.finditer(response_pattern, content, re.DOTALL):
-        name, model, response = match.groups()
-        result["responses"][model] = response.strip()
 
-    return result
+def score_unparsed(text: str) -> List[Dict]:
+    """Score output with no recognisable response headers
 
+    Falls back to scanning the whole text: every Size/Scope marker is one
+    unweighted vote, and an open question anywhere flags the lot.
+    """
+    sizes = []
+    open_questions = False
+    for match in RESPONSE_SIGNAL_RE.finditer(text):
+        if match.group("size"):
+            sizes.append(match.group("size").upper())
+        elif match.group("question"):
+            open_questions = True
+    return ([{"size": size, "confidence": 1.0, "open_questions": open_questions} for size in sizes]
+            or [{"size": None, "confidence": 1.0, "open_questions": open_questions}])
 
-def extract_scope_from_response(response: str) -> Optional[str]:
-    """Extract scope estimate from a model response"""
-    patterns = [
-        r'\*\*Size:\*\*\s*(XS|S|M|L|XL)',
-        r'\*\*Scope[^:]*:\*\*\s*(XS|S|M|L|XL)',
-        r'Size:\s*(XS|S|M|L|XL)',
-        r'Scope:\s*(XS|S|M|L|XL)',
-    ]
 
-    for pattern in patterns:
-        match = re.search(pattern, response, re.IGNORECASE)
-        if match:
-            return match.group(1).upper()
-    return None
+def weighted_scope_consensus(scores: List[Dict]) -> Tuple[Optional[str], Dict[str, int], float]:
+    """Aggregate score_response results into a confidence-weighted vote
 
+    Returns (top_scope, vote_counts, share) where share is the top scope's
+    fraction of the total confidence weight.
+    """
+    counts: Counter = Counter()
+    weights: Dict[str, float] = defaultdict(float)
 
-def get_scope_consensus(results: Dict) -> Tuple[Optional[str], Dict[str, int]]:
-    """Determine scope consensus from model responses"""
-    scope_votes = defaultdict(int)
+    for score in scores:
+        if score["size"]:
+            counts[score["size"]] += 1
+            weights[score["size"]] += score["confidence"]
 
-    for model, response in results.get("responses", {}).items():
-        scope = extract_scope_from_response(response)
-        if scope:
-            scope_votes[scope] += 1
+    if not counts:
+        return None, {}, 0.0
 
-    if not scope_votes:
-        return None, {}
+    top_scope = max(weights, key=weights.get)
+    total_weight = sum(weights.values())
+    share = weights[top_scope] / total_weight if total_weight else 0.0
+    return top_scope, dict(counts), share
 
-    # Find most common
-    sorted_votes = sorted(scope_votes.items(), key=lambda x: x[1], reverse=True)
-    top_scope, top_count = sorted_votes[0]
-    total_votes = sum(scope_votes.values())
+
+def get_scope_consensus(results: Dict) -> Tuple[Optional[str], Dict[str, int]]:
+    """Determine scope consensus from model responses (one weighted vote per model)"""
+    scores = [score_response(r) for r in results.get("responses", {}).values()]
+    top_scope, votes, share = weighted_scope_consensus(scores)
 
     # Need majority or plurality
-    if top_count >= total_votes / 2:
-        return top_scope, dict(scope_votes)
+    if top_scope and share >= 0.5:
+        return top_scope, votes
+
+    return None, votes
+
+
+class ModelStat:
+    """Per-model aggregate for a run (slotted - one small object per model)"""
+    __slots__ = ("runs", "time", "tokens", "failures", "avg_time", "avg_tokens")
+
+    def __init__(self):
+        self.runs = 0
+        self.time = 0
+        self.tokens = 0
+        self.failures = 0
+        self.avg_time: Optional[float] = None
+        self.avg_tokens: Optional[int] = None
+
+    def to_dict(self) -> Dict:
+        """JSON-ready dict; averages are omitted until the model has a successful run"""
+        return {name: getattr(self, name) for name in self.__slots__
+                if getattr(self, name) is not None}
 
-    return None, dict(scope_votes)
+
+def _parse_issue_file(results_file: Path) -> Tuple[Optional[Dict], Optional[str]]:
+    """Pool worker: parse one results file, returning (results, error)"""
+    try:
+        return parse_results_file(results_file), None
+    except Exception as e:
+        return None, f"{results_file.name}: {str(e)}"
+
+
+def load_analysis_cache(run_dir: Path) -> Dict[str, Dict]:
+    """Load cached parse results for a run ({} if missing, stale or unreadable)"""
+    try:
+        with open(run_dir / ANALYSIS_CACHE_NAME) as f:
+            cache = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if cache.get("version") != ANALYSIS_CACHE_VERSION:
+        return {}
+    return cache.get("files", {})
+
+
+def save_analysis_cache(run_dir: Path, entries: Dict[str, Dict]):
+    """Write parse results back; a read-only run dir just means no caching"""
+    try:
+        with open(run_dir / ANALYSIS_CACHE_NAME, "w") as f:
+            json.dump({"version": ANALYSIS_CACHE_VERSION, "files": entries}, f)
+    except OSError:
+        pass
 
 
 def analyze_run(run_dir: Path) -> Dict:
     """Analyze a complete triage run from raw results"""
     analysis = {
         "issues": [],
-        "model_stats": defaultdict(lambda: {"runs": 0, "time": 0, "tokens": 0, "failures": 0}),
+        "model_stats": {},
         "scope_distribution": defaultdict(int),
         "errors": []
     }
 
-    for results_file in sorted(run_dir.glob("issue-*-results.txt")):
+    files = sorted(run_dir.glob("issue-*-results.txt"))
+
+    # Results files are write-once, so (mtime, size) is enough to reuse a parse
+    cache = load_analysis_cache(run_dir)
+    entries: Dict[str, Dict] = {}
+    parsed: Dict[str, Tuple[Optional[Dict], Optional[str]]] = {}
+    stale: List[Path] = []
+    for results_file in files:
+        st = results_file.stat()
+        key = {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+        hit = cache.get(results_file.name)
+        if hit and hit["mtime_ns"] == key["mtime_ns"] and hit["size"] == key["size"]:
+            parsed[results_file.name] = (hit["results"], None)
+            entries[results_file.name] = hit
+        else:
+            stale.append(results_file)
+            entries[results_file.name] = key
+
+    # Parsing is pure per-file CPU work, so fan it out; aggregation stays serial
+    if len(stale) >= PARALLEL_MIN_FILES:
+        with ProcessPoolExecutor() as ex:
+            fresh = list(ex.map(_parse_issue_file, stale, chunksize=8))
+    else:
+        fresh = [_parse_issue_file(f) for f in stale]
+
+    for results_file, (results, error) in zip(stale, fresh):
+        parsed[results_file.name] = (results, error)
+        if error:
+            del entries[results_file.name]
+        else:
+            entries[results_file.name]["results"] = results
+
+    if stale or len(entries) != len(cache):
+        save_analysis_cache(run_dir, entries)
+
+    for results_file in files:
+        results, error = parsed[results_file.name]
+        if error:
+            analysis["errors"].append(error)
+            continue
         try:
-            issue_num = int(re.search(r'issue-(\d+)-results', results_file.name).group(1))
-            results = parse_results_file(results_file)
+            issue_num = int(ISSUE_NUM_RE.search(results_file.name).group(1))
 
             # Get scope consensus
             scope, votes = get_scope_consensus(results)
@@ -135,23 +359,24 @@ def analyze_run(run_dir: Path) -> Dict:
             analysis["issues"].append(issue_data)
 
             # Aggregate model stats
+            model_stats = analysis["model_stats"]
             for m in results["models"]:
-                stats = analysis["model_stats"][m["model"]]
+                stats = model_stats.get(m["model"]) or model_stats.setdefault(m["model"], ModelStat())
                 if m["status"] == "done":
-                    stats["runs"] += 1
-                    stats["time"] += m.get("time", 0)
-                    stats["tokens"] += m.get("tokens", 0)
+                    stats.runs += 1
+                    stats.time += m.get("time", 0)
+                    stats.tokens += m.get("tokens", 0)
                 else:
-                    stats["failures"] += 1
+                    stats.failures += 1
 
         except Exception as e:
             analysis["errors"].append(f"{results_file.name}: {str(e)}")
 
     # Calculate averages
-    for model, stats in analysis["model_stats"].items():
-        if stats["runs"] > 0:
-            stats["avg_time"] = round(stats["time"] / stats["runs"], 2)
-            stats["avg_tokens"] = round(stats["tokens"] / stats["runs"])
+    for stats in analysis["model_stats"].values():
+        if stats.runs > 0:
+            stats.avg_time = round(stats.time / stats.runs, 2)
+            stats.avg_tokens = round(stats.tokens / stats.runs)
 
     return analysis
 
@@ -189,9 +414,9 @@ def print_analysis_report(analysis: Dict, verbose: bool = False):
     print(f"{'Model':<35} {'Runs':>5} {'Avg Time':>10} {'Avg Tok':>8} {'Fail':>5}")
     print("-" * 70)
 
-    sorted_models = sorted(model_stats.items(), key=lambda x: x[1].get("avg_time", 0), reverse=True)
+    sorted_models = sorted(model_stats.items(), key=lambda x: x[1].avg_time or 0, reverse=True)
     for model, stats in sorted_models:
-        print(f"{model:<35} {stats['runs']:>5} {stats.get('avg_time', 0):>9.1f}s {stats.get('avg_tokens', 0):>8} {stats['failures']:>5}")
+        print(f"{model:<35} {stats.runs:>5} {stats.avg_time or 0:>9.1f}s {stats.avg_tokens or 0:>8} {stats.failures:>5}")
     print()
 
     # Recommendations
@@ -199,28 +424,28 @@ def print_analysis_report(analysis: Dict, verbose: bool = False):
     print("-" * 30)
 
     # Find slow models
-    slow_models = [m for m, s in model_stats.items() if s.get("avg_time", 0) > 100]
+    slow_models = [m for m, s in model_stats.items() if (s.avg_time or 0) > 100]
     if slow_models:
         print(f"  ❌ SLOW (>100s): {', '.join(slow_models)}")
 
     # Find unreliable models
     unreliable = [m for m, s in model_stats.items()
-                  if s["failures"] > 0 and s["failures"] / (s["runs"] + s["failures"]) > 0.1]
+                  if s.failures > 0 and s.failures / (s.runs + s.failures) > 0.1]
     if unreliable:
         print(f"  ❌ UNRELIABLE (>10% fail): {', '.join(unreliable)}")
 
     # Find fast & reliable
     fast_reliable = [m for m, s in model_stats.items()
-                     if s.get("avg_time", 999) < 50 and s["failures"] == 0 and s["runs"] > 5]
+                     if s.avg_time is not None and s.avg_time < 50 and s.failures == 0 and s.runs > 5]
     if fast_reliable:
         print(f"  ✅ FAST & RELIABLE: {', '.join(fast_reliable)}")
 
     # Best value (fast + good output)
     best_value = [(m, s) for m, s in model_stats.items()
-                  if s.get("avg_time", 999) < 40 and s.get("avg_tokens", 0) > 400 and s["failures"] == 0]
+                  if s.avg_time is not None and s.avg_time < 40 and (s.avg_tokens or 0) > 400 and s.failures == 0]
     if best_value:
-        bv = sorted(best_value, key=lambda x: x[1]["avg_tokens"], reverse=True)[0]
-        print(f"  ⭐ BEST VALUE: {bv[0]} ({bv[1]['avg_time']}s, {bv[1]['avg_tokens']} tokens)")
+        bv = sorted(best_value, key=lambda x: x[1].avg_tokens, reverse=True)[0]
+        print(f"  ⭐ BEST VALUE: {bv[0]} ({bv[1].avg_time}s, {bv[1].avg_tokens} tokens)")
 
     print()
 
@@ -232,16 +457,19 @@ def print_analysis_report(analysis: Dict, verbose: bool = False):
 
 def export_analysis_json(analysis: Dict, output_path: Path):
     """Export analysis to JSON file"""
-    # Convert defaultdicts to regular dicts
+    # Convert defaultdicts / ModelStats to plain JSON types
     export = {
         "issues": analysis["issues"],
-        "model_stats": dict(analysis["model_stats"]),
+        "model_stats": {m: s.to_dict() for m, s in analysis["model_stats"].items()},
         "scope_distribution": dict(analysis["scope_distribution"]),
         "errors": analysis["errors"]
     }
 
-    with open(output_path, "w") as f:
-        json.dump(export, f, indent=2)
+    if orjson:
+        Path(output_path).write_bytes(orjson.dumps(export, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_path, "w") as f:
+            json.dump(export, f, indent=2)
 
     print(f"Exported to: {output_path}")
 
@@ -300,7 +528,7 @@ def main():
         if args.json:
             print(json.dumps({
                 "issues": analysis["issues"],
-                "model_stats": dict(analysis["model_stats"]),
+                "model_stats": {m: s.to_dict() for m, s in analysis["model_stats"].items()},
                 "scope_distribution": dict(analysis["scope_distribution"])
             }, indent=2))
         else:
@@ -4,13 +4,25 @@
 Provides streaming, disk-efficient logging with automatic retention management.
 """
 
+import atexit
 import json
 import os
+import re
 import gzip
 import shutil
-from datetime import datetime, timedelta
+import sqlite3
+import time
+import weakref
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterator, List, TextIO
+
+try:
+    import orjson
+except ImportError:  # optional - stdlib json works, just slower
+    orjson = None
 
 # Default paths
 CLOOD_DIR = Path.home() / ".clood"
@@ -19,9 +31,78 @@ JSONL_DIR = TRIAGE_DIR / "logs"
 RAW_DIR = TRIAGE_DIR / "raw"
 ARCHIVE_DIR = TRIAGE_DIR / "archive"
 
+# SQLite index of run summaries - list/benchmark query this instead of
+# opening every summary JSON (which stay on disk as the source of truth).
+# Each run remembers its summary file's name, mtime and size, so opening the
+# index only re-reads summaries that were added or changed since.
+INDEX_DB = TRIAGE_DIR / "index.sqlite"
+INDEX_VERSION = 2  # PRAGMA user_version; bump when the schema changes
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    summary_file TEXT,
+    mtime_ns INTEGER,
+    size INTEGER,
+    start_time TEXT,
+    issues INTEGER,
+    duration REAL
+);
+CREATE TABLE IF NOT EXISTS model_stats (
+    run_id TEXT,
+    model TEXT,
+    runs INTEGER,
+    failures INTEGER,
+    total_time REAL,
+    avg_tokens INTEGER,
+    PRIMARY KEY (run_id, model)
+);
+"""
+
+# Summaries are named triage-<run_id>-i<issues>-d<duration>-summary.json so a
+# run's stats show in a directory listing; older runs use the plain
+# triage-<run_id>-summary.json name. Either way the body is authoritative.
+_LIST_RE = re.compile(r"triage-(?P<id>.+)-i(?P<i>\d+)-d(?P<d>[\d.]+)-summary\.json")
+
 # Retention settings
 RAW_RETENTION_DAYS = 7
 COMPRESS_AFTER_DAYS = 1
+COMPRESS_LEVEL = 1             # JSONL squeezes well even at gzip's fastest level
+COMPRESS_CHUNK = 1 << 20       # 1MB copy chunks
+
+
+def dumps_line(obj: Any) -> bytes:
+    """Serialize one compact JSON line (orjson when available)"""
+    if orjson:
+        return orjson.dumps(obj) + b"\n"
+    return json.dumps(obj, separators=(",", ":")).encode() + b"\n"
+
+
+# Most buffers one writev() call accepts (1024 on Linux and macOS)
+_IOV_MAX = os.sysconf("SC_IOV_MAX") if "SC_IOV_MAX" in getattr(os, "sysconf_names", {}) else 1024
+
+
+def _write_all(fd: int, chunks: List[bytes], total: int):
+    """Write all chunks to fd, gathering them with writev where available"""
+    if hasattr(os, "writev") and len(chunks) <= _IOV_MAX:
+        written = os.writev(fd, chunks)
+        if written == total:
+            return
+        data = memoryview(b"".join(chunks))[written:]  # short write: finish the rest
+    else:
+        data = memoryview(b"".join(chunks))
+    while data:
+        data = data[os.write(fd, data):]
+
+
+def _cap(s: Optional[str], n: int) -> Optional[str]:
+    """Truncate to n chars, passing None and short strings through untouched"""
+    return s if s is None or len(s) <= n else s[:n]
+
+
+def load_json(path: Path) -> Any:
+    """Read and parse a JSON file from raw bytes (orjson when available)"""
+    data = Path(path).read_bytes()
+    return orjson.loads(data) if orjson else json.loads(data)
 
 
 def ensure_dirs():
@@ -30,24 +111,142 @@ def ensure_dirs():
         d.mkdir(parents=True, exist_ok=True)
 
 
+# Loggers with an open descriptor, held weakly so the exit hook below doesn't
+# keep dropped loggers (and their descriptors) alive
+_open_loggers = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_loggers():
+    """Flush and close loggers that were never closed"""
+    for logger in list(_open_loggers):
+        logger.close()
+
+
 class TriageLogger:
-    """Streaming JSONL logger for triage runs"""
+    """Streaming JSONL logger for triage runs
+
+    Entry "ts" fields are integer epoch nanoseconds (time.time_ns()); convert
+    with datetime.fromtimestamp(ts / 1e9) where a readable time is needed.
+    With precision="s" they are whole epoch seconds instead, read once per
+    batch and shared by every entry in it.
+
+    Keeps one append descriptor open for the whole run and batches entries in
+    memory, writing them out once FLUSH_ENTRIES / FLUSH_BYTES pile up or
+    FLUSH_INTERVAL seconds have passed since the last write. Use it as a
+    context manager (or call finalize()/close()); a logger that is never
+    closed flushes when it is garbage collected or at interpreter exit.
+
+    fsync picks the durability level: "batch" (default) fsyncs after each
+    batch write, "entry" writes and fsyncs every entry, "never" leaves it to
+    the OS - fine for benchmark runs whose logs can be regenerated.
+    finalize() always fsyncs before writing the summary.
+    """
 
-    def __init__(self, run_id: Optional[str] = None):
+    FLUSH_ENTRIES = 64
+    FLUSH_BYTES = 64 * 1024
+    FLUSH_INTERVAL = 1.0  # seconds
+
+    def __init__(self, run_id: Optional[str] = None, precision: str = "ns", fsync: str = "batch"):
+        if precision not in ("ns", "s"):
+            raise ValueError(f"precision must be 'ns' or 's', not {precision!r}")
+        if fsync not in ("never", "batch", "entry"):
+            raise ValueError(f"fsync must be 'never', 'batch' or 'entry', not {fsync!r}")
         ensure_dirs()
-        self.run_id = run_id or datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.start_time = datetime.now()
+        self.run_id = run_id or self.start_time.strftime("%Y%m%d-%H%M%S")
         self.log_path = JSONL_DIR / f"triage-{self.run_id}.jsonl"
         self.summary_path = JSONL_DIR / f"triage-{self.run_id}-summary.json"
-        self.start_time = datetime.now()
+        self.precision = precision
+        self.fsync = fsync
         self.issues_processed = 0
-        self.model_stats: Dict[str, Dict] = {}
+        # model -> [runs, time, tokens, failures]; expanded into dicts in finalize()
+        self.model_stats: Dict[str, List] = {}
+        self._fd: Optional[int] = None
+        self._open()
+        self._buf: List[bytes] = []
+        self._buf_bytes = 0
+        self._last_flush = time.monotonic()
+        self._batch_ts: Optional[int] = None
+        self._unsynced = False  # written since the last fsync
+
+    def _open(self):
+        """Open the raw O_APPEND descriptor: each batch is one unbuffered append syscall"""
+        self._fd = os.open(self.log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        _open_loggers.add(self)
+
+    def __del__(self):
+        # A logger dropped without close() still writes its buffered tail
+        if getattr(self, "_fd", None) is not None:
+            self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def _timestamp(self) -> int:
+        """Entry timestamp: per-entry nanoseconds, or one whole second per batch"""
+        if self.precision == "ns":
+            return time.time_ns()
+        # A batch that has sat past FLUSH_INTERVAL is about to be flushed; don't stamp with its old second
+        if self._batch_ts is None or time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL:
+            self._batch_ts = int(time.time())
+        return self._batch_ts
+
+    def _write(self, entry: Dict):
+        """Queue one JSONL entry, flushing if the batch is big or old enough"""
+        line = dumps_line(entry)
+        self._buf.append(line)
+        self._buf_bytes += len(line)
+
+        if (self.fsync == "entry" or len(self._buf) >= self.FLUSH_ENTRIES
+                or self._buf_bytes >= self.FLUSH_BYTES or time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL):
+            self.flush()
+
+    def flush(self):
+        """Write any queued entries to the log in one call"""
+        if self._buf:
+            if self._fd is None:  # logging after close()/finalize() reopens the log
+                self._open()
+            _write_all(self._fd, self._buf, self._buf_bytes)
+            self._buf.clear()
+            self._buf_bytes = 0
+            self._unsynced = True
+        if self._unsynced and self.fsync != "never":
+            self.sync()
+        self._batch_ts = None
+        self._last_flush = time.monotonic()
+
+    def sync(self):
+        """fsync whatever has been written to the log so far"""
+        if self._unsynced:
+            os.fsync(self._fd)
+            self._unsynced = False
+
+    def close(self, sync: bool = False):
+        """Flush and close the log descriptor (safe to call more than once)
+
+        Logging again afterwards reopens the log and appends to it.
+        """
+        if self._buf:
+            self.flush()  # reopens the log for entries queued after an earlier close()
+        if self._fd is not None:
+            if sync:
+                self.sync()
+            os.close(self._fd)
+            self._fd = None
+            self._unsynced = False  # nothing left to fsync through this descriptor
+            _open_loggers.discard(self)
 
     def log_model_result(self, issue_num: int, model: str,
                          time_sec: float, tokens: int, tok_sec: float,
                          status: str = "done", error: Optional[str] = None):
         """Log a single model result (append to JSONL)"""
         entry = {
-            "ts": datetime.now().isoformat(),
+            "ts": self._timestamp(),
             "issue": issue_num,
             "model": model,
             "time": round(time_sec, 2),
@@ -56,40 +255,36 @@ class TriageLogger:
             "status": status
         }
         if error:
-            entry["error"] = error[:200]  # Truncate long errors
+            entry["error"] = _cap(error, 200)  # Truncate long errors
 
-        with open(self.log_path, "a") as f:
-            f.write(json.dumps(entry) + "\n")
+        self._write(entry)
 
         # Update running stats
-        if model not in self.model_stats:
-            self.model_stats[model] = {"runs": 0, "time": 0, "tokens": 0, "failures": 0}
-
-        stats = self.model_stats[model]
+        stats = self.model_stats.get(model) or self.model_stats.setdefault(model, [0, 0.0, 0, 0])
         if status == "done":
-            stats["runs"] += 1
-            stats["time"] += time_sec
-            stats["tokens"] += tokens
+            stats[0] += 1
+            stats[1] += time_sec
+            stats[2] += tokens
         else:
-            stats["failures"] += 1
+            stats[3] += 1
 
     def log_issue_complete(self, issue_num: int, title: str,
                           winner_model: str, scope_consensus: Optional[str] = None):
         """Log issue completion"""
         entry = {
-            "ts": datetime.now().isoformat(),
+            "ts": self._timestamp(),
             "event": "issue_complete",
             "issue": issue_num,
-            "title": title[:100],
+            "title": _cap(title, 100),
             "winner": winner_model,
             "scope": scope_consensus
         }
-        with open(self.log_path, "a") as f:
-            f.write(json.dumps(entry) + "\n")
+        self._write(entry)
         self.issues_processed += 1
 
     def finalize(self):
-        """Write final summary and return stats"""
+        """Close the log, write final summary and return stats"""
+        self.close(sync=True)
         duration = (datetime.now() - self.start_time).total_seconds()
 
         summary = {
@@ -100,22 +295,104 @@ class TriageLogger:
             "model_stats": {}
         }
 
-        for model, stats in self.model_stats.items():
-            runs = stats["runs"]
+        for model, (runs, total_time, tokens, failures) in self.model_stats.items():
             summary["model_stats"][model] = {
                 "runs": runs,
-                "failures": stats["failures"],
-                "avg_time": round(stats["time"] / runs, 2) if runs else 0,
-                "avg_tokens": round(stats["tokens"] / runs) if runs else 0,
-                "total_time": round(stats["time"], 1)
+                "failures": failures,
+                "avg_time": round(total_time / runs, 2) if runs else 0,
+                "avg_tokens": round(tokens / runs) if runs else 0,
+                "total_time": round(total_time, 1)
             }
 
-        with open(self.summary_path, "w") as f:
-            json.dump(summary, f, indent=2)
+        # The stats are in the name, so a repeat finalize() writes a new file; drop the old one
+        stale = find_summary_path(self.run_id)
+        self.summary_path = JSONL_DIR / (
+            f"triage-{self.run_id}-i{self.issues_processed}-d{summary['duration_sec']}-summary.json")
+        if orjson:
+            self.summary_path.write_bytes(orjson.dumps(summary, option=orjson.OPT_INDENT_2))
+        else:
+            with open(self.summary_path, "w") as f:
+                json.dump(summary, f, indent=2)
+        if stale is not None and stale != self.summary_path:
+            stale.unlink(missing_ok=True)
+
+        # Opening the index reconciles it, which picks up the summary just written
+        # (or the next open does, if SQLite fails here)
+        conn = open_run_index()
+        if conn is not None:
+            conn.close()
 
         return summary
 
 
+_NL = "\n"
+
+# The comment is emitted as: head, table rows, response opener, response, tail
+_COMMENT_HEAD = """## 🐱 Catfight Triage Summary
+
+{scope_line}**Winner:** {winner_model} ({winner_time:.1f}s)
+**Models:** {model_count} | **Issue:** #{issue_num}
+
+| Model | Time | Tokens | Tok/s | Status |
+|-------|------|--------|-------|--------|
+"""
+
+_COMMENT_RESPONSE_OPEN = """
+
+<details>
+<summary>📝 Winning Response ({winner_model})</summary>
+
+"""
+
+_COMMENT_TAIL = """
+
+</details>
+
+---
+*Triage by clood catfight - compact summary mode*
+"""
+
+
+def _summary_row(r: Dict) -> str:
+    """One markdown table row for format_github_summary"""
+    get = r.get
+    t, toks = get("time"), get("toks")
+    return (f"| {_cap(r['model'], 25)} | {f'{t:.1f}s' if t else '-'} | {get('tokens', '-')} | "
+            f"{f'{toks:.1f}' if toks else '-'} | {'✅' if get('status') == 'done' else '❌'} |")
+
+
+def _iter_comment_chunks(issue_num: int, model_results: List[Dict],
+                         winner_response: str, scope_consensus: Optional[str] = None) -> Iterator[str]:
+    """Yield the summary comment piece by piece (see format_github_summary)"""
+    # Winner is the fastest successful model
+    winner = min((r for r in model_results if r.get("status") == "done" and r.get("time") is not None),
+                 key=lambda r: r["time"], default=None)
+    winner_model = winner["model"] if winner else None
+    winner_time = winner["time"] if winner else float('inf')
+
+    yield _COMMENT_HEAD.format(
+        scope_line=f"**Scope Consensus:** {scope_consensus}\n" if scope_consensus else "",
+        winner_model=winner_model,
+        winner_time=winner_time,
+        model_count=len(model_results),
+        issue_num=issue_num,
+    )
+    for i, r in enumerate(model_results):
+        if i:
+            yield _NL
+        yield _summary_row(r)
+    yield _COMMENT_RESPONSE_OPEN.format(winner_model=winner_model)
+    yield _cap(winner_response, 6000)
+    yield _COMMENT_TAIL
+
+
+def format_github_summary_into(fh: TextIO, issue_num: int, title: str, model_results: List[Dict],
+                               winner_response: str, scope_consensus: Optional[str] = None):
+    """Write the summary comment to `fh` without building the whole string"""
+    for chunk in _iter_comment_chunks(issue_num, model_results, winner_response, scope_consensus):
+        fh.write(chunk)
+
+
 def format_github_summary(issue_num: int, title: str, model_results: List[Dict],
                           winner_response: str, scope_consensus: Optional[str] = None) -> str:
     """Format a compact GitHub comment with triage summary
@@ -130,61 +407,49 @@ def format_github_summary(issue_num: int, title: str, model_results: List[Dict],
     Returns:
         Markdown-formatted comment string
     """
-    # Build results table
-    table_rows = []
-    winner_model = None
-    winner_time = float('inf')
-
-    for r in model_results:
-        status = "✅" if r.get("status") == "done" else "❌"
-        time_str = f"{r['time']:.1f}s" if r.get("time") else "-"
-        tokens_str = str(r.get("tokens", "-"))
-        toks_str = f"{r['toks']:.1f}" if r.get("toks") else "-"
+    return "".join(_iter_comment_chunks(issue_num, model_results, winner_response, scope_consensus))
 
-        table_rows.append(f"| {r['model'][:25]} | {time_str} | {tokens_str} | {toks_str} | {status} |")
 
-        if r.get("status") == "done" and r.get("time", float('inf')) < winner_time:
-            winner_time = r["time"]
-            winner_model = r["model"]
+def _fast_ymd(s: str) -> date:
+    """Parse a YYYYMMDD prefix without strptime's format/locale machinery"""
+    return date(int(s[0:4]), int(s[4:6]), int(s[6:8]))
 
-    scope_line = f"**Scope Consensus:** {scope_consensus}\n" if scope_consensus else ""
 
-    comment = f"""## 🐱 Catfight Triage Summary
+def _should_compress(item: Path, today: date) -> bool:
+    """True if a JSONL log is older than COMPRESS_AFTER_DAYS (by its run-id date)"""
+    try:
+        file_date = _fast_ymd(item.name.split("-")[1])
+    except (ValueError, IndexError):
+        return False
+    return (today - file_date).days > COMPRESS_AFTER_DAYS and not item.suffix == ".gz"
 
-{scope_line}**Winner:** {winner_model} ({winner_time:.1f}s)
-**Models:** {len(model_results)} | **Issue:** #{issue_num}
-
-| Model | Time | Tokens | Tok/s | Status |
-|-------|------|--------|-------|--------|
-{chr(10).join(table_rows)}
-
-<details>
-<summary>📝 Winning Response ({winner_model})</summary>
 
-{winner_response[:6000]}
-
-</details>
-
----
-*Triage by clood catfight - compact summary mode*
-"""
-    return comment
+def _compress_one(item: Path):
+    """Gzip one log and remove the original"""
+    # Compress to a temp name and rename, so a crash never
+    # leaves a truncated .gz next to a deleted original
+    gz_path = str(item) + '.gz'
+    tmp_path = gz_path + '.tmp'
+    with open(item, 'rb') as f_in, \
+            gzip.open(tmp_path, 'wb', compresslevel=COMPRESS_LEVEL) as f_out:
+        shutil.copyfileobj(f_in, f_out, length=COMPRESS_CHUNK)
+    os.replace(tmp_path, gz_path)
+    item.unlink()
 
 
 def cleanup_old_data():
     """Remove old raw data, compress old logs"""
     ensure_dirs()
-    now = datetime.now()
+    today = date.today()
     cleaned = {"deleted": 0, "compressed": 0}
 
-    # Clean raw results older than retention period
+    # Clean raw results older than retention period (serial - rmtree is IO-bound)
     if RAW_DIR.exists():
         for item in RAW_DIR.iterdir():
             if item.is_dir():
                 try:
                     # Parse date from directory name
-                    dir_date = datetime.strptime(item.name[:8], "%Y%m%d")
-                    age = (now - dir_date).days
+                    age = (today - _fast_ymd(item.name)).days
 
                     if age > RAW_RETENTION_DAYS:
                         shutil.rmtree(item)
@@ -192,97 +457,230 @@ def cleanup_old_data():
                 except (ValueError, IndexError):
                     pass
 
-    # Compress old JSONL logs
+    # Compress old JSONL logs in parallel - zlib releases the GIL while compressing
     if JSONL_DIR.exists():
-        for item in JSONL_DIR.glob("*.jsonl"):
-            try:
-                file_date = datetime.strptime(item.name.split("-")[1][:8], "%Y%m%d")
-                age = (now - file_date).days
-
-                if age > COMPRESS_AFTER_DAYS and not item.suffix == ".gz":
-                    # Compress
-                    with open(item, 'rb') as f_in:
-                        with gzip.open(str(item) + '.gz', 'wb') as f_out:
-                            shutil.copyfileobj(f_in, f_out)
-                    item.unlink()
-                    cleaned["compressed"] += 1
-            except (ValueError, IndexError):
-                pass
+        todo = [item for item in JSONL_DIR.glob("*.jsonl") if _should_compress(item, today)]
+        if todo:
+            with ThreadPoolExecutor(max_workers=min(len(todo), os.cpu_count() or 1)) as ex:
+                cleaned["compressed"] = len(list(ex.map(_compress_one, todo)))
 
     return cleaned
 
 
+def find_summary_path(run_id: str) -> Optional[Path]:
+    """Summary file for a run, under either the stats-encoded or legacy name"""
+    for path in JSONL_DIR.glob(f"triage-{run_id}-i*-summary.json"):
+        match = _LIST_RE.fullmatch(path.name)
+        if match and match.group("id") == run_id:
+            return path
+    legacy = JSONL_DIR / f"triage-{run_id}-summary.json"
+    return legacy if legacy.exists() else None
+
+
 def load_run_summary(run_id: str) -> Optional[Dict]:
     """Load summary for a specific run"""
-    summary_path = JSONL_DIR / f"triage-{run_id}-summary.json"
-    if summary_path.exists():
-        with open(summary_path) as f:
-            return json.load(f)
+    summary_path = find_summary_path(run_id)
+    if summary_path is not None:
+        return load_json(summary_path)
     return None
 
 
+def load_summaries(paths: List[Any]) -> Dict[Any, Dict]:
+    """Parsed summaries for `paths`, keyed by the same objects
+
+    `paths` may be Path objects or os.DirEntry items. Missing or corrupt
+    files are left out.
+    """
+    summaries: Dict[Any, Dict] = {}
+    for path in paths:
+        try:
+            summaries[path] = load_json(os.fspath(path))
+        except (FileNotFoundError, ValueError):  # JSONDecodeError (stdlib and orjson) subclass ValueError
+            continue
+    return summaries
+
+
+def _index_summary(conn: sqlite3.Connection, summary: Dict, path: Path, st: os.stat_result):
+    """Upsert one run summary into the index (caller owns the transaction)"""
+    run_id = summary.get("run_id")
+    conn.execute(
+        "INSERT OR REPLACE INTO runs (run_id, summary_file, mtime_ns, size, start_time, issues, duration) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (run_id, path.name, st.st_mtime_ns, st.st_size, summary.get("start_time"),
+         summary.get("issues_processed", 0), summary.get("duration_sec", 0))
+    )
+    conn.execute("DELETE FROM model_stats WHERE run_id = ?", (run_id,))
+    conn.executemany(
+        "INSERT INTO model_stats (run_id, model, runs, failures, total_time, avg_tokens) VALUES (?, ?, ?, ?, ?, ?)",
+        [(run_id, model, stats.get("runs", 0), stats.get("failures", 0),
+          stats.get("total_time", 0), stats.get("avg_tokens", 0))
+         for model, stats in summary.get("model_stats", {}).items()]
+    )
+
+
+def _summary_run_id(name: str) -> str:
+    """Run id encoded in a summary file name (stats-encoded or legacy)"""
+    match = _LIST_RE.fullmatch(name)
+    if match:
+        return match.group("id")
+    return name[len("triage-"):-len("-summary.json")]
+
+
+def _reconcile_index(conn: sqlite3.Connection):
+    """Bring the index in line with the summaries on disk
+
+    Summaries that are new or changed since they were indexed (runs from
+    before the index existed, or whose insert in finalize() failed) are
+    read and upserted; runs whose summary is gone are dropped.
+    """
+    # run_id -> (path, stat), newest file winning if a stale one was left behind
+    on_disk: Dict[str, tuple] = {}
+    for path in JSONL_DIR.glob("triage-*-summary.json"):
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            continue
+        run_id = _summary_run_id(path.name)
+        if run_id not in on_disk or st.st_mtime_ns > on_disk[run_id][1].st_mtime_ns:
+            on_disk[run_id] = (path, st)
+
+    indexed = {row[0]: row[1:] for row in conn.execute("SELECT run_id, summary_file, mtime_ns, size FROM runs")}
+    changed = {run_id: (path, st) for run_id, (path, st) in on_disk.items()
+               if indexed.get(run_id) != (path.name, st.st_mtime_ns, st.st_size)}
+    gone = [(run_id,) for run_id in indexed if run_id not in on_disk]
+    if not changed and not gone:
+        return
+
+    with conn:
+        conn.executemany("DELETE FROM runs WHERE run_id = ?", gone)
+        conn.executemany("DELETE FROM model_stats WHERE run_id = ?", gone)
+        for path, summary in load_summaries([path for path, _ in changed.values()]).items():
+            _index_summary(conn, summary, path, changed[_summary_run_id(path.name)][1])
+
+
+def open_run_index() -> Optional[sqlite3.Connection]:
+    """Open the SQLite run index, reconciled against the JSON summaries on disk
+
+    Returns None if SQLite can't be used; callers fall back to scanning JSON.
+    """
+    ensure_dirs()
+    try:
+        conn = sqlite3.connect(INDEX_DB)
+        if conn.execute("PRAGMA user_version").fetchone()[0] != INDEX_VERSION:
+            # Older layout: rebuild it, the summaries are the source of truth
+            conn.executescript("DROP TABLE IF EXISTS runs; DROP TABLE IF EXISTS model_stats;")
+            conn.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+        conn.executescript(INDEX_SCHEMA)
+        _reconcile_index(conn)
+        return conn
+    except sqlite3.Error:
+        return None
+
+
 def list_runs() -> List[Dict]:
     """List all triage runs with basic stats"""
+    conn = open_run_index()
+    if conn is not None:
+        try:
+            rows = conn.execute(
+                "SELECT run_id, start_time, issues, duration FROM runs ORDER BY run_id DESC"
+            ).fetchall()
+            return [{"run_id": r[0], "start_time": r[1], "issues": r[2], "duration": r[3]} for r in rows]
+        except sqlite3.Error:
+            pass
+        finally:
+            conn.close()
+
+    return _list_runs_from_json()
+
+
+def _list_runs_from_json() -> List[Dict]:
+    """list_runs fallback: read every summary"""
     runs = []
+    seen = set()
     ensure_dirs()
 
-    for item in sorted(JSONL_DIR.glob("*-summary.json"), reverse=True):
-        try:
-            with open(item) as f:
-                summary = json.load(f)
-                runs.append({
-                    "run_id": summary.get("run_id"),
-                    "start_time": summary.get("start_time"),
-                    "issues": summary.get("issues_processed", 0),
-                    "duration": summary.get("duration_sec", 0)
-                })
-        except (json.JSONDecodeError, KeyError):
-            pass
+    # scandir hands back names + types straight from the directory read
+    with os.scandir(JSONL_DIR) as it:
+        entries = [e for e in it if e.name.endswith("-summary.json") and e.is_file(follow_symlinks=False)]
+    entries.sort(key=lambda e: e.name, reverse=True)
+
+    for summary in load_summaries(entries).values():
+        run_id = summary.get("run_id")
+        if run_id in seen:  # a stale summary left by a finalize() that died before cleaning up
+            continue
+        seen.add(run_id)
+        runs.append({
+            "run_id": run_id,
+            "start_time": summary.get("start_time"),
+            "issues": summary.get("issues_processed", 0),
+            "duration": summary.get("duration_sec", 0)
+        })
 
     return runs
 
 
 def get_model_benchmarks(run_ids: Optional[List[str]] = None) -> Dict[str, Dict]:
     """Aggregate model performance across runs"""
+    conn = open_run_index()
+    if conn is not None:
+        try:
+            query = ("SELECT model, SUM(runs), SUM(failures), SUM(total_time), SUM(avg_tokens * runs) "
+                     "FROM model_stats")
+            params: List[str] = []
+            if run_ids is not None:
+                query += f" WHERE run_id IN ({', '.join('?' * len(run_ids))})"
+                params = list(run_ids)
+            query += " GROUP BY model"
+
+            return _finish_benchmarks({model: totals for model, *totals in conn.execute(query, params)})
+        except sqlite3.Error:
+            pass
+        finally:
+            conn.close()
+
+    return _benchmarks_from_json(run_ids)
+
+
+def _benchmarks_from_json(run_ids: Optional[List[str]] = None) -> Dict[str, Dict]:
+    """get_model_benchmarks fallback: aggregate straight from the summary JSONs"""
     ensure_dirs()
 
     if run_ids is None:
         # Use all runs
         summaries = list(JSONL_DIR.glob("*-summary.json"))
     else:
-        summaries = [JSONL_DIR / f"triage-{rid}-summary.json" for rid in run_ids]
+        summaries = [p for p in map(find_summary_path, run_ids) if p is not None]
 
-    aggregated: Dict[str, Dict] = {}
+    # model -> [runs, failures, total_time, total_tokens]
+    aggregated: Dict[str, List] = defaultdict(lambda: [0, 0, 0, 0])
 
-    for path in summaries:
-        if not path.exists():
-            continue
-        try:
-            with open(path) as f:
-                summary = json.load(f)
-
-            for model, stats in summary.get("model_stats", {}).items():
-                if model not in aggregated:
-                    aggregated[model] = {"runs": 0, "failures": 0, "total_time": 0, "total_tokens": 0}
-
-                agg = aggregated[model]
-                agg["runs"] += stats.get("runs", 0)
-                agg["failures"] += stats.get("failures", 0)
-                agg["total_time"] += stats.get("total_time", 0)
-                # Estimate total tokens from avg
-                agg["total_tokens"] += stats.get("avg_tokens", 0) * stats.get("runs", 0)
-        except (json.JSONDecodeError, KeyError):
-            pass
+    for summary in load_summaries(summaries).values():
+        for model, stats in summary.get("model_stats", {}).items():
+            runs = stats.get("runs", 0)
+            agg = aggregated[model]
+            agg[0] += runs
+            agg[1] += stats.get("failures", 0)
+            agg[2] += stats.get("total_time", 0)
+            # Estimate total tokens from avg
+            agg[3] += stats.get("avg_tokens", 0) * runs
+
+    return _finish_benchmarks(aggregated)
+
+
+def _benchmark_entry(runs, failures, total_time, total_tokens) -> Dict:
+    """Per-model benchmark dict, with averages once the model has runs"""
+    entry = {"runs": runs, "failures": failures, "total_time": total_time, "total_tokens": total_tokens}
+    if runs > 0:
+        entry["avg_time"] = round(total_time / runs, 2)
+        entry["avg_tokens"] = round(total_tokens / runs)
+        entry["failure_rate"] = round(failures / (runs + failures) * 100, 1)
+    return entry
 
-    # Calculate averages
-    for model, agg in aggregated.items():
-        runs = agg["runs"]
-        if runs > 0:
-            agg["avg_time"] = round(agg["total_time"] / runs, 2)
-            agg["avg_tokens"] = round(agg["total_tokens"] / runs)
-            agg["failure_rate"] = round(agg["failures"] / (runs + agg["failures"]) * 100, 1)
 
-    return aggregated
+def _finish_benchmarks(aggregated: Dict[str, Any]) -> Dict[str, Dict]:
+    """Expand per-model [runs, failures, total_time, total_tokens] totals"""
+    return {model: _benchmark_entry(*totals) for model, totals in aggregated.items()}
 
 
 if __name__ == "__main__":
@@ -8,55 +8,245 @@ Features:
 - GitHub label sync recommendations
 """
 
+import heapq
 import json
+import mmap
 import os
 import re
 import subprocess
 import sys
-from collections import defaultdict
+from bisect import bisect_right
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 
+try:
+    import orjson
+except ImportError:  # optional - stdlib json works, just slower on big runs
+    orjson = None
+
+GH_REPO = "dirtybirdnj/clood"
+LABEL_WORKERS = 8  # concurrent `gh issue edit` calls in label-sync --apply
+
+# Parse result files in worker processes once a run has at least this many
+PARALLEL_MIN_FILES = 8
+
+# Parsed issue data is cached next to the run; bump when _parse_one's output changes
+REPORT_CACHE_NAME = ".triage_cache.json"
+REPORT_CACHE_VERSION = 2
+
+# Patterns compiled once at import (the fallback parser's included).
+# The fallback parser matches raw file bytes and decodes only what it keeps.
+# Header names/models never span lines; keeping [^)] off newlines stops an
+# unclosed "(" from scanning to the end of the file on every header (quadratic)
+_RESULTS_RE = re.compile(
+    rb'>>> \[(\d+)/(\d+)\] (\S+) \(([^)\n]+)\)(?: on \S+)?\s+(?:DONE (\d+\.?\d*)s \| (\d+) tokens \| (\d+\.?\d*) tok/s|(FAILED|ERROR))')
+# Multi-host runs append " on <host>" to the winner line and response headers
+_WINNER_RE = re.compile(rb'WINNER: (\S+)(?: on \S+)? wins with ([\d.]+)s')
+_RESPONSE_RE = re.compile(rb'### (\S+) \(([^)\n]+)\)(?: on (\S+))?\n-+\n(.*?)(?=\n### |\n$|\Z)', re.DOTALL)
+_SCOPE_RE = re.compile(r'(?:\*\*Size:\*\*|\*\*Scope[^:]*:\*\*|Size:|Scope:)\s*(XS|S|M|L|XL)', re.IGNORECASE)
+# Every scope marker contains one of these once casefolded (the regex ignores case too)
+_SCOPE_HINTS = ("size", "scope")
+_FNAME_RE = re.compile(r'^issue-(\d+)-results\.txt$')
+
+# Consensus level -> bucket: bisect_right(thresholds, level) indexes the names below
+_CONSENSUS_THRESHOLDS = (0.25, 0.5, 0.75)
+_CONSENSUS_LEVELS = ("none", "low", "medium", "high")
+_CONSENSUS_BUCKETS = ("no_consensus", "low_consensus", "medium_consensus", "high_consensus")
+# Which fields each consensus_report bucket lists per issue (after "issue")
+_BUCKET_FIELDS = {
+    "high_consensus": ("scope", "agreement", "level"),
+    "medium_consensus": ("scope", "agreement", "level", "votes"),
+    "low_consensus": ("scope", "votes"),
+    "no_consensus": ("votes",),
+}
+
+# Scope distribution bars, one block per 5%
+_BARS = ["█" * i for i in range(21)]
+
+# Response quality indicators (see score_response_quality). These run over the
+# casefolded response, so they're written lowercase and compiled without re.I -
+# case-insensitive matching folds every character on every attempt
+_SCORE_CODE = re.compile(r'```\w*\n')
+_SCORE_PLAN = re.compile(r'implementation plan|step \d|phase \d|\d\.\s+\w')
+_SCORE_DIAGRAM = re.compile(r'```mermaid')
+_SCORE_QUESTIONS = re.compile(r'open question|unclear|need.*(?:clarif|more info)')
+
 # Try to import from triage_analyze
 try:
-    from triage_analyze import parse_results_file, extract_scope_from_response
+    from triage_analyze import parse_results_file, extract_scope_from_response, ANALYSIS_CACHE_VERSION
+    PARSER_NAME = "triage_analyze"
+    # Parser changes in triage_analyze bump its version, which must stale our cache too
+    PARSER_VERSION = ANALYSIS_CACHE_VERSION
 except ImportError:
+    PARSER_NAME = "inline"
+    PARSER_VERSION = REPORT_CACHE_VERSION
+
     # Inline the functions if import fails
     def parse_results_file(filepath: Path) -> Dict:
-        with open(filepath) as f:
-            content = f.read()
+        with open(filepath, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:  # mmap can't map an empty file
+                return _parse_results_content(b"")
+            # Scan the page cache directly rather than copying the file into the heap
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                return _parse_results_content(content)
+
+    def _parse_results_content(content) -> Dict:
         result = {"models": [], "winner": None, "responses": {}}
-        pattern = r'>>> \[(\d+)/(\d+)\] (\S+) \(([^)]+)\)\s+(?:DONE (\d+\.?\d*)s \| (\d+) tokens \| (\d+\.?\d*) tok/s|(FAILED|ERROR)[^\n]*)'
-        for match in re.finditer(pattern, content):
+        for match in _RESULTS_RE.finditer(content):
             idx, total, name, model, time, tokens, toks, error = match.groups()
-            model_result = {"name": name, "model": model, "status": "done" if time else "failed"}
+            model_result = {"name": name.decode(), "model": model.decode(), "status": "done" if time else "failed"}
             if time:
                 model_result["time"] = float(time)
                 model_result["tokens"] = int(tokens)
                 model_result["toks"] = float(toks)
             result["models"].append(model_result)
-        winner_match = re.search(r'WINNER: (\S+) wins with ([\d.]+)s', content)
+        winner_match = _WINNER_RE.search(content)
         if winner_match:
-            result["winner"] = {"name": winner_match.group(1), "time": float(winner_match.group(2))}
-        response_pattern = r'### (\S+) \(([^)]+)\)\n-+\n(.*?)(?=\n### |\n$|\Z)'
-        for match in re.finditer(response_pattern, content, re.DOTALL):
-            name, model, response = match.groups()
-            result["responses"][model] = response.strip()
+            result["winner"] = {"name": winner_match.group(1).decode(), "time": float(winner_match.group(2))}
+        for match in _RESPONSE_RE.finditer(content):
+            name, model, host, response = match.groups()
+            key = model.decode() + ("@" + host.decode() if host else "")
+            result["responses"][key] = response.decode("utf-8", "replace").strip()
         return result
 
     def extract_scope_from_response(response: str) -> Optional[str]:
-        patterns = [
-            r'\*\*Size:\*\*\s*(XS|S|M|L|XL)',
-            r'\*\*Scope[^:]*:\*\*\s*(XS|S|M|L|XL)',
-            r'Size:\s*(XS|S|M|L|XL)',
-            r'Scope:\s*(XS|S|M|L|XL)',
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, response, re.IGNORECASE)
-            if match:
-                return match.group(1).upper()
-        return None
+        folded = response.casefold()
+        if not any(hint in folded for hint in _SCOPE_HINTS):
+            return None
+        match = _SCOPE_RE.search(response)
+        return match.group(1).upper() if match else None
+
+
+def load_report_cache(run_dir: Path) -> Dict[str, Dict]:
+    """Load cached per-file issue data for a run ({} if missing, stale or unreadable)"""
+    try:
+        data = (run_dir / REPORT_CACHE_NAME).read_bytes()
+        cache = orjson.loads(data) if orjson else json.loads(data)
+    except (OSError, ValueError):
+        return {}
+    # Entries from the other parser (triage_analyze vs the inline fallback), or
+    # from an older version of it, don't carry over
+    if (not isinstance(cache, dict) or cache.get("version") != REPORT_CACHE_VERSION
+            or cache.get("parser") != PARSER_NAME or cache.get("parser_version") != PARSER_VERSION):
+        return {}
+    return cache.get("files", {})
+
+
+def save_report_cache(run_dir: Path, files: Dict[str, Dict]):
+    """Write per-file issue data back; a read-only run dir just means no caching"""
+    cache = {"version": REPORT_CACHE_VERSION, "parser": PARSER_NAME, "parser_version": PARSER_VERSION,
+             "files": files}
+    try:
+        (run_dir / REPORT_CACHE_NAME).write_bytes(
+            orjson.dumps(cache) if orjson else json.dumps(cache).encode())
+    except OSError:
+        pass
+
+
+# Default for score_response_quality's precomputed_scope (None means "no scope found")
+_UNSCANNED = object()
+
+
+def score_response_quality(response: str, precomputed_scope: Any = _UNSCANNED) -> Dict:
+    """Score a single response for quality indicators
+
+    Pass the response's already-extracted scope (None if it had none) as
+    precomputed_scope to skip scanning for it again.
+    """
+    if precomputed_scope is _UNSCANNED:
+        precomputed_scope = extract_scope_from_response(response)
+    response_ci = response.casefold()
+    score = {
+        "has_code": bool(_SCORE_CODE.search(response_ci)),
+        "has_plan": bool(_SCORE_PLAN.search(response_ci)),
+        "has_diagram": bool(_SCORE_DIAGRAM.search(response_ci)),
+        "has_questions": bool(_SCORE_QUESTIONS.search(response_ci)),
+        "has_scope": precomputed_scope is not None,
+        # Approximate word count from separators: two C-level scans, no list of substrings
+        "tokens": response.count(" ") + response.count("\n") + 1
+    }
+
+    # Calculate total score (0-5)
+    score["total_score"] = sum([
+        score["has_code"],
+        score["has_plan"],
+        score["has_diagram"],
+        score["has_questions"],
+        score["has_scope"]
+    ])
+
+    return score
+
+
+def _parse_one(results_file: Path) -> Tuple[Optional[Dict], Optional[str]]:
+    """Pool worker: parse one results file into its issue entry, returning (data, error)"""
+    try:
+        results = parse_results_file(results_file)
+
+        # Extract scopes from each model
+        scopes = {}
+        for model, response in results.get("responses", {}).items():
+            scope = extract_scope_from_response(response)
+            if scope:
+                scopes[model] = scope
+
+        # Calculate consensus
+        if scopes:
+            top_scope = Counter(scopes.values()).most_common(1)[0]
+            consensus_level = top_scope[1] / len(scopes)
+        else:
+            top_scope = (None, 0)
+            consensus_level = 0
+
+        return {
+            "results": results,
+            "scopes": scopes,
+            # Quality scores are computed here, in the worker, so reports just aggregate them
+            "quality": {model: score_response_quality(response, scopes.get(model))
+                        for model, response in results.get("responses", {}).items()},
+            "scope_consensus": top_scope[0],
+            "scope_votes": top_scope[1],
+            "total_votes": len(scopes),
+            "consensus_level": consensus_level,
+            "models_run": len(results["models"]),
+            "models_succeeded": sum(1 for m in results["models"] if m["status"] == "done")
+        }, None
+    except Exception as e:
+        return None, f"Error parsing {results_file}: {e}"
+
+
+def _existing_labels() -> set:
+    """Names of the labels already on GH_REPO (empty if gh can't list them)"""
+    try:
+        result = subprocess.run(
+            ["gh", "label", "list", "--repo", GH_REPO, "--limit", "1000", "--json", "name"],
+            capture_output=True, text=True
+        )
+        if result.returncode == 0:
+            return {label["name"] for label in json.loads(result.stdout)}
+    except (OSError, ValueError):
+        pass
+    return set()
+
+
+def _edit_issue_labels(item: Dict) -> str:
+    """Add one issue's labels via gh, returning its status line"""
+    try:
+        labels = ",".join(item["add_labels"])
+        result = subprocess.run(
+            ["gh", "issue", "edit", str(item["issue"]),
+             "--repo", GH_REPO,
+             "--add-label", labels],
+            capture_output=True, text=True
+        )
+        if result.returncode == 0:
+            return f"  ✓ #{item['issue']}: {labels}"
+        return f"  ✗ #{item['issue']}: {result.stderr}"
+    except Exception as e:
+        return f"  ✗ #{item['issue']}: {e}"
 
 
 class TriageReporter:
@@ -65,45 +255,57 @@ class TriageReporter:
     def __init__(self, run_dir: Path):
         self.run_dir = Path(run_dir)
         self.issues: Dict[int, Dict] = {}
+        # (issue count it was built for, report) - see scope_report
+        self._scope_cache: Optional[Tuple[int, Dict]] = None
         self._parse_all_results()
 
     def _parse_all_results(self):
         """Parse all result files in the run directory"""
-        for results_file in sorted(self.run_dir.glob("issue-*-results.txt")):
-            try:
-                issue_num = int(re.search(r'issue-(\d+)-results', results_file.name).group(1))
-                results = parse_results_file(results_file)
-
-                # Extract scopes from each model
-                scopes = {}
-                for model, response in results.get("responses", {}).items():
-                    scope = extract_scope_from_response(response)
-                    if scope:
-                        scopes[model] = scope
-
-                # Calculate consensus
-                if scopes:
-                    scope_counts = defaultdict(int)
-                    for s in scopes.values():
-                        scope_counts[s] += 1
-                    top_scope = max(scope_counts.items(), key=lambda x: x[1])
-                    consensus_level = top_scope[1] / len(scopes)
-                else:
-                    top_scope = (None, 0)
-                    consensus_level = 0
-
-                self.issues[issue_num] = {
-                    "results": results,
-                    "scopes": scopes,
-                    "scope_consensus": top_scope[0],
-                    "scope_votes": top_scope[1],
-                    "total_votes": len(scopes),
-                    "consensus_level": consensus_level,
-                    "models_run": len(results["models"]),
-                    "models_succeeded": sum(1 for m in results["models"] if m["status"] == "done")
-                }
-            except Exception as e:
-                print(f"Error parsing {results_file}: {e}", file=sys.stderr)
+        # One directory read; the file-name match also yields the issue number
+        with os.scandir(self.run_dir) as it:
+            entries = [(e.name, int(m.group(1)), e) for e in it
+                       if (m := _FNAME_RE.match(e.name)) and e.is_file()]
+        # Numeric issue order, so #100 doesn't land between #10 and #11
+        entries.sort(key=lambda entry: entry[1])
+
+        # Results files are write-once, so (mtime, size) is enough to reuse a parse
+        cache = load_report_cache(self.run_dir)
+        fresh_cache: Dict[str, Dict] = {}
+        parsed: Dict[str, Tuple[Optional[Dict], Optional[str]]] = {}
+        stale: List[Path] = []
+        for name, _, entry in entries:
+            st = entry.stat()
+            key = {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+            hit = cache.get(name)
+            if hit and hit["mtime_ns"] == key["mtime_ns"] and hit["size"] == key["size"]:
+                parsed[name] = (hit["data"], None)
+                fresh_cache[name] = hit
+            else:
+                stale.append(Path(entry.path))
+                fresh_cache[name] = key
+
+        if len(stale) >= PARALLEL_MIN_FILES:
+            with ProcessPoolExecutor() as ex:
+                results = list(ex.map(_parse_one, stale, chunksize=8))
+        else:
+            results = [_parse_one(path) for path in stale]
+
+        for path, (data, error) in zip(stale, results):
+            parsed[path.name] = (data, error)
+            if error:
+                del fresh_cache[path.name]
+            else:
+                fresh_cache[path.name]["data"] = data
+
+        if stale or len(fresh_cache) != len(cache):
+            save_report_cache(self.run_dir, fresh_cache)
+
+        for name, issue_num, _ in entries:
+            data, error = parsed[name]
+            if error:
+                print(error, file=sys.stderr)
+            else:
+                self.issues[issue_num] = data
 
     # =========================================================================
     # 2. SCOPE AGGREGATION REPORT
@@ -111,6 +313,48 @@ class TriageReporter:
 
     def scope_report(self, output_json: bool = False) -> Dict:
         """Generate scope aggregation report"""
+        if self._scope_cache is not None and self._scope_cache[0] == len(self.issues):
+            report = self._scope_cache[1]
+        else:
+            report = self._build_scope_report()
+            self._scope_cache = (len(self.issues), report)
+
+        if output_json:
+            return report
+
+        # Print report - buffered and written out in one go
+        out = []
+        out.append("=" * 60)
+        out.append("SCOPE AGGREGATION REPORT")
+        out.append("=" * 60)
+        out.append(f"\nTotal Issues: {report['total_issues']}")
+        out.append(f"Issues with Scope: {report['issues_with_scope']}")
+        out.append(f"Missing Scope: {report['total_issues'] - report['issues_with_scope']}")
+        out.append("\nDISTRIBUTION:")
+        out.append("-" * 40)
+
+        for scope in ["XS", "S", "M", "L", "XL"]:
+            data = report["by_scope"][scope]
+            bar = _BARS[min(int(data["percentage"] / 5), 20)]
+            out.append(f"  {scope:>2}: {bar:<20} {data['count']:>3} ({data['percentage']:.0f}%)")
+            if data["issues"]:
+                out.append(f"      Issues: {', '.join(f'#{i}' for i in heapq.nsmallest(10, data['issues']))}")
+                if len(data["issues"]) > 10:
+                    out.append(f"      ... and {len(data['issues']) - 10} more")
+
+        out.append("\nPRIORITY QUEUE (by effort):")
+        out.append("-" * 40)
+        # XS first, then S, M, L, XL
+        for scope in ["XS", "S", "M", "L", "XL"]:
+            issues = report["distribution"].get(scope, [])
+            if issues:
+                out.append(f"  {scope}: {', '.join(f'#{i}' for i in sorted(issues))}")
+
+        sys.stdout.write("\n".join(out) + "\n")
+        return report
+
+    def _build_scope_report(self) -> Dict:
+        """Aggregate consensus scopes across issues (memoized by scope_report)"""
         report = {
             "total_issues": len(self.issues),
             "issues_with_scope": 0,
@@ -133,36 +377,6 @@ class TriageReporter:
                 "percentage": round(len(issues) / max(report["issues_with_scope"], 1) * 100, 1)
             }
 
-        if output_json:
-            return report
-
-        # Print report
-        print("=" * 60)
-        print("SCOPE AGGREGATION REPORT")
-        print("=" * 60)
-        print(f"\nTotal Issues: {report['total_issues']}")
-        print(f"Issues with Scope: {report['issues_with_scope']}")
-        print(f"Missing Scope: {report['total_issues'] - report['issues_with_scope']}")
-        print("\nDISTRIBUTION:")
-        print("-" * 40)
-
-        for scope in ["XS", "S", "M", "L", "XL"]:
-            data = report["by_scope"][scope]
-            bar = "█" * int(data["percentage"] / 5)
-            print(f"  {scope:>2}: {bar:<20} {data['count']:>3} ({data['percentage']:.0f}%)")
-            if data["issues"]:
-                print(f"      Issues: {', '.join(f'#{i}' for i in sorted(data['issues'])[:10])}")
-                if len(data["issues"]) > 10:
-                    print(f"      ... and {len(data['issues']) - 10} more")
-
-        print("\nPRIORITY QUEUE (by effort):")
-        print("-" * 40)
-        # XS first, then S, M, L, XL
-        for scope in ["XS", "S", "M", "L", "XL"]:
-            issues = report["distribution"].get(scope, [])
-            if issues:
-                print(f"  {scope}: {', '.join(f'#{i}' for i in sorted(issues))}")
-
         return report
 
     # =========================================================================
@@ -191,68 +405,54 @@ class TriageReporter:
                     "reason": f"Only {succeeded}/{total} models succeeded",
                     "scope": data["scope_consensus"]
                 })
-            elif level >= 0.75:
-                report["high_consensus"].append({
-                    "issue": issue_num,
-                    "scope": data["scope_consensus"],
-                    "agreement": f"{data['scope_votes']}/{data['total_votes']}",
-                    "level": round(level * 100)
-                })
-            elif level >= 0.5:
-                report["medium_consensus"].append({
-                    "issue": issue_num,
+            else:
+                bucket = _CONSENSUS_BUCKETS[bisect_right(_CONSENSUS_THRESHOLDS, level)]
+                fields = {
                     "scope": data["scope_consensus"],
                     "agreement": f"{data['scope_votes']}/{data['total_votes']}",
                     "level": round(level * 100),
                     "votes": data["scopes"]
-                })
-            elif level >= 0.25:
-                report["low_consensus"].append({
-                    "issue": issue_num,
-                    "scope": data["scope_consensus"],
-                    "votes": data["scopes"]
-                })
-            else:
-                report["no_consensus"].append({
-                    "issue": issue_num,
-                    "votes": data["scopes"]
-                })
+                }
+                report[bucket].append({"issue": issue_num,
+                                       **{name: fields[name] for name in _BUCKET_FIELDS[bucket]}})
 
         if output_json:
             return report
 
-        # Print report
-        print("=" * 60)
-        print("ISSUE CLUSTERING BY MODEL CONSENSUS")
-        print("=" * 60)
+        # Print report - buffered and written out in one go
+        out = []
+        out.append("=" * 60)
+        out.append("ISSUE CLUSTERING BY MODEL CONSENSUS")
+        out.append("=" * 60)
 
-        print(f"\n✅ HIGH CONSENSUS (75%+): {len(report['high_consensus'])} issues")
-        print("-" * 40)
-        for item in sorted(report["high_consensus"], key=lambda x: x["level"], reverse=True)[:15]:
-            print(f"  #{item['issue']:>3} - Scope: {item['scope']} ({item['agreement']} agree, {item['level']}%)")
+        out.append(f"\n✅ HIGH CONSENSUS (75%+): {len(report['high_consensus'])} issues")
+        out.append("-" * 40)
+        for item in heapq.nlargest(15, report["high_consensus"], key=lambda x: x["level"]):
+            out.append(f"  #{item['issue']:>3} - Scope: {item['scope']} ({item['agreement']} agree, {item['level']}%)")
 
-        print(f"\n⚠️  MEDIUM CONSENSUS (50-74%): {len(report['medium_consensus'])} issues")
-        print("-" * 40)
+        out.append(f"\n⚠️  MEDIUM CONSENSUS (50-74%): {len(report['medium_consensus'])} issues")
+        out.append("-" * 40)
         for item in report["medium_consensus"][:10]:
             votes_str = ", ".join(f"{m}: {s}" for m, s in list(item.get("votes", {}).items())[:3])
-            print(f"  #{item['issue']:>3} - Scope: {item['scope']} ({item['level']}%) - {votes_str}")
+            out.append(f"  #{item['issue']:>3} - Scope: {item['scope']} ({item['level']}%) - {votes_str}")
 
-        print(f"\n🔶 LOW CONSENSUS (25-49%): {len(report['low_consensus'])} issues")
-        print("-" * 40)
+        out.append(f"\n🔶 LOW CONSENSUS (25-49%): {len(report['low_consensus'])} issues")
+        out.append("-" * 40)
         for item in report["low_consensus"][:10]:
             votes_str = ", ".join(f"{m}: {s}" for m, s in list(item.get("votes", {}).items())[:3])
-            print(f"  #{item['issue']:>3} - Split: {votes_str}")
+            out.append(f"  #{item['issue']:>3} - Split: {votes_str}")
 
-        print(f"\n❌ NO CONSENSUS (<25%): {len(report['no_consensus'])} issues")
-        print("-" * 40)
+        out.append(f"\n❌ NO CONSENSUS (<25%): {len(report['no_consensus'])} issues")
+        out.append("-" * 40)
         for item in report["no_consensus"][:10]:
-            print(f"  #{item['issue']:>3} - No clear scope")
+            out.append(f"  #{item['issue']:>3} - No clear scope")
 
-        print(f"\n🔧 NEEDS REVIEW (failures): {len(report['needs_review'])} issues")
-        print("-" * 40)
+        out.append(f"\n🔧 NEEDS REVIEW (failures): {len(report['needs_review'])} issues")
+        out.append("-" * 40)
         for item in report["needs_review"][:10]:
-            print(f"  #{item['issue']:>3} - {item['reason']}")
+            out.append(f"  #{item['issue']:>3} - {item['reason']}")
 
+        sys.stdout.write("\n".join(out) + "\n")
         return report
 
     # =========================================================================
@@ -262,29 +462,35 @@ class TriageReporter:
     def quality_report(self, output_json: bool = False) -> Dict:
         """Score response quality across models and issues"""
         report = {
-            "model_quality": defaultdict(lambda: {
-                "has_code": 0, "has_plan": 0, "has_diagram": 0,
-                "has_questions": 0, "total": 0, "avg_tokens": 0, "total_tokens": 0
-            }),
+            "model_quality": {},
             "issue_quality": {},
             "best_responses": [],
             "weak_responses": []
         }
 
+        # Per-model counters as parallel lists indexed by model id (first-seen order)
+        model_ids: Dict[str, int] = {}
+        has_code, has_plan, has_diagram, has_questions, totals, total_tokens = [], [], [], [], [], []
+        columns = (has_code, has_plan, has_diagram, has_questions, totals, total_tokens)
+        # One row per response, classified into best/weak after the loop
+        resp_issue, resp_model, resp_score, resp_tokens = [], [], [], []
+
         for issue_num, data in self.issues.items():
             issue_scores = []
 
-            for model, response in data["results"].get("responses", {}).items():
-                score = self._score_response(response)
-
+            for model, score in data["quality"].items():
                 # Update model stats
-                mq = report["model_quality"][model]
-                mq["total"] += 1
-                mq["has_code"] += 1 if score["has_code"] else 0
-                mq["has_plan"] += 1 if score["has_plan"] else 0
-                mq["has_diagram"] += 1 if score["has_diagram"] else 0
-                mq["has_questions"] += 1 if score["has_questions"] else 0
-                mq["total_tokens"] += score["tokens"]
+                mid = model_ids.get(model)
+                if mid is None:
+                    mid = model_ids[model] = len(model_ids)
+                    for column in columns:
+                        column.append(0)
+                totals[mid] += 1
+                has_code[mid] += score["has_code"]
+                has_plan[mid] += score["has_plan"]
+                has_diagram[mid] += score["has_diagram"]
+                has_questions[mid] += score["has_questions"]
+                total_tokens[mid] += score["tokens"]
 
                 issue_scores.append({
                     "model": model,
@@ -293,87 +499,71 @@ class TriageReporter:
                     "details": score
                 })
 
-                # Track best/weak
-                if score["total_score"] >= 4:
-                    report["best_responses"].append({
-                        "issue": issue_num,
-                        "model": model,
-                        "score": score["total_score"],
-                        "tokens": score["tokens"]
-                    })
-                elif score["total_score"] <= 1 and score["tokens"] > 50:
-                    report["weak_responses"].append({
-                        "issue": issue_num,
-                        "model": model,
-                        "score": score["total_score"],
-                        "tokens": score["tokens"]
-                    })
+                resp_issue.append(issue_num)
+                resp_model.append(model)
+                resp_score.append(score["total_score"])
+                resp_tokens.append(score["tokens"])
 
             report["issue_quality"][issue_num] = issue_scores
 
-        # Calculate averages
-        for model, mq in report["model_quality"].items():
-            if mq["total"] > 0:
-                mq["avg_tokens"] = round(mq["total_tokens"] / mq["total"])
-                mq["code_rate"] = round(mq["has_code"] / mq["total"] * 100, 1)
-                mq["plan_rate"] = round(mq["has_plan"] / mq["total"] * 100, 1)
-                mq["diagram_rate"] = round(mq["has_diagram"] / mq["total"] * 100, 1)
+        # Track best/weak: threshold the score/token columns, then build rows for the hits
+        best_idx = [i for i, sc in enumerate(resp_score) if sc >= 4]
+        weak_idx = [i for i, (sc, tok) in enumerate(zip(resp_score, resp_tokens)) if sc <= 1 and tok > 50]
+        for idx, key in ((best_idx, "best_responses"), (weak_idx, "weak_responses")):
+            report[key] = [{"issue": resp_issue[i], "model": resp_model[i],
+                            "score": resp_score[i], "tokens": resp_tokens[i]} for i in idx]
+
+        # Materialize per-model stats with averages (every seen model has total >= 1)
+        for model, mid in model_ids.items():
+            total = totals[mid]
+            report["model_quality"][model] = {
+                "has_code": has_code[mid], "has_plan": has_plan[mid], "has_diagram": has_diagram[mid],
+                "has_questions": has_questions[mid], "total": total,
+                "avg_tokens": round(total_tokens[mid] / total), "total_tokens": total_tokens[mid],
+                "code_rate": round(has_code[mid] / total * 100, 1),
+                "plan_rate": round(has_plan[mid] / total * 100, 1),
+                "diagram_rate": round(has_diagram[mid] / total * 100, 1),
+            }
 
         if output_json:
             return {
-                "model_quality": dict(report["model_quality"]),
+                "model_quality": report["model_quality"],
                 "best_responses": report["best_responses"][:20],
                 "weak_responses": report["weak_responses"][:20]
             }
 
-        # Print report
-        print("=" * 60)
-        print("RESPONSE QUALITY SCORING")
-        print("=" * 60)
+        # Print report - buffered and written out in one go
+        out = []
+        out.append("=" * 60)
+        out.append("RESPONSE QUALITY SCORING")
+        out.append("=" * 60)
 
-        print("\nMODEL QUALITY SCORES:")
-        print("-" * 70)
-        print(f"{'Model':<30} {'Code%':>7} {'Plan%':>7} {'Diag%':>7} {'AvgTok':>8}")
-        print("-" * 70)
+        out.append("\nMODEL QUALITY SCORES:")
+        out.append("-" * 70)
+        out.append(f"{'Model':<30} {'Code%':>7} {'Plan%':>7} {'Diag%':>7} {'AvgTok':>8}")
+        out.append("-" * 70)
 
         for model, mq in sorted(report["model_quality"].items(),
                                 key=lambda x: x[1].get("code_rate", 0), reverse=True):
-            print(f"{model:<30} {mq.get('code_rate', 0):>6.0f}% {mq.get('plan_rate', 0):>6.0f}% "
-                  f"{mq.get('diagram_rate', 0):>6.0f}% {mq.get('avg_tokens', 0):>8}")
+            out.append(f"{model:<30} {mq.get('code_rate', 0):>6.0f}% {mq.get('plan_rate', 0):>6.0f}% "
+                       f"{mq.get('diagram_rate', 0):>6.0f}% {mq.get('avg_tokens', 0):>8}")
 
-        print(f"\n⭐ BEST RESPONSES ({len(report['best_responses'])} total):")
-        print("-" * 40)
-        for item in sorted(report["best_responses"], key=lambda x: x["score"], reverse=True)[:10]:
-            print(f"  #{item['issue']:>3} - {item['model']:<25} (score: {item['score']}, {item['tokens']} tok)")
+        out.append(f"\n⭐ BEST RESPONSES ({len(report['best_responses'])} total):")
+        out.append("-" * 40)
+        for item in heapq.nlargest(10, report["best_responses"], key=lambda x: x["score"]):
+            out.append(f"  #{item['issue']:>3} - {item['model']:<25} (score: {item['score']}, {item['tokens']} tok)")
 
-        print(f"\n⚠️  WEAK RESPONSES ({len(report['weak_responses'])} total):")
-        print("-" * 40)
+        out.append(f"\n⚠️  WEAK RESPONSES ({len(report['weak_responses'])} total):")
+        out.append("-" * 40)
         for item in report["weak_responses"][:10]:
-            print(f"  #{item['issue']:>3} - {item['model']:<25} (score: {item['score']}, {item['tokens']} tok)")
+            out.append(f"  #{item['issue']:>3} - {item['model']:<25} (score: {item['score']}, {item['tokens']} tok)")
 
+        sys.stdout.write("\n".join(out) + "\n")
         return report
 
-    def _score_response(self, response: str) -> Dict:
+    def _score_response(self, response: str, precomputed_scope: Any = _UNSCANNED) -> Dict:
         """Score a single response for quality indicators"""
-        score = {
-            "has_code": bool(re.search(r'```\w*\n', response)),
-            "has_plan": bool(re.search(r'(implementation plan|step \d|phase \d|\d\.\s+\w)', response, re.I)),
-            "has_diagram": bool(re.search(r'```mermaid', response, re.I)),
-            "has_questions": bool(re.search(r'(open question|unclear|need.*(clarif|more info))', response, re.I)),
-            "has_scope": extract_scope_from_response(response) is not None,
-            "tokens": len(response.split())
-        }
-
-        # Calculate total score (0-5)
-        score["total_score"] = sum([
-            score["has_code"],
-            score["has_plan"],
-            score["has_diagram"],
-            score["has_questions"],
-            score["has_scope"]
-        ])
-
-        return score
+        return score_response_quality(response, precomputed_scope)
 
     # =========================================================================
     # 6. GITHUB LABEL SYNC
@@ -416,14 +606,7 @@ class TriageReporter:
 
             # Consensus label
             level = data["consensus_level"]
-            if level >= 0.75:
-                labels_to_add.append(consensus_labels["high"])
-            elif level >= 0.5:
-                labels_to_add.append(consensus_labels["medium"])
-            elif level >= 0.25:
-                labels_to_add.append(consensus_labels["low"])
-            else:
-                labels_to_add.append(consensus_labels["none"])
+            labels_to_add.append(consensus_labels[_CONSENSUS_LEVELS[bisect_right(_CONSENSUS_THRESHOLDS, level)]])
 
             # Check for failures
             if data["models_succeeded"] < data["models_run"] * 0.75:
@@ -439,63 +622,58 @@ class TriageReporter:
         if output_json:
             return report
 
-        # Print report
-        print("=" * 60)
-        print("GITHUB LABEL SYNC RECOMMENDATIONS")
-        print("=" * 60)
+        # Print report - buffered and written out in one go
+        out = []
+        out.append("=" * 60)
+        out.append("GITHUB LABEL SYNC RECOMMENDATIONS")
+        out.append("=" * 60)
 
-        print("\nLABELS TO CREATE (if not exist):")
-        print("-" * 40)
+        out.append("\nLABELS TO CREATE (if not exist):")
+        out.append("-" * 40)
         for label in report["labels_to_create"]:
-            print(f"  - {label}")
+            out.append(f"  - {label}")
 
-        print(f"\nISSUES TO UPDATE ({len(report['issues_to_update'])}):")
-        print("-" * 60)
-        print(f"{'Issue':>6} {'Scope':>6} {'Consensus':>10} Labels")
-        print("-" * 60)
+        out.append(f"\nISSUES TO UPDATE ({len(report['issues_to_update'])}):")
+        out.append("-" * 60)
+        out.append(f"{'Issue':>6} {'Scope':>6} {'Consensus':>10} Labels")
+        out.append("-" * 60)
 
         for item in sorted(report["issues_to_update"], key=lambda x: x["issue"]):
             labels = ", ".join(item["add_labels"])
-            print(f"#{item['issue']:>5} {item['scope'] or '-':>6} {item['consensus']:>9}% {labels}")
+            out.append(f"#{item['issue']:>5} {item['scope'] or '-':>6} {item['consensus']:>9}% {labels}")
 
         if apply:
-            print("\nAPPLYING LABELS...")
+            out.append("\nAPPLYING LABELS...")
+            # _apply_labels prints progress as it goes; emit what we have first
+            sys.stdout.write("\n".join(out) + "\n")
+            out = []
             self._apply_labels(report)
 
-        print("\nTo apply these labels, run:")
-        print("  python3 triage_report.py label-sync --apply")
+        out.append("\nTo apply these labels, run:")
+        out.append("  python3 triage_report.py label-sync --apply")
 
+        sys.stdout.write("\n".join(out) + "\n")
         return report
 
     def _apply_labels(self, report: Dict):
         """Actually apply labels to GitHub issues"""
-        # First, ensure labels exist
+        # First, ensure labels exist - one listing call, then create only the missing ones
+        existing = _existing_labels()
         for label in report["labels_to_create"]:
+            if label in existing:
+                continue
             try:
-                # Check if label exists, create if not
-                result = subprocess.run(
-                    ["gh", "label", "create", label, "--repo", "dirtybirdnj/clood", "--force"],
+                subprocess.run(
+                    ["gh", "label", "create", label, "--repo", GH_REPO, "--force"],
                     capture_output=True, text=True
                 )
             except Exception as e:
                 print(f"  Warning: Could not create label {label}: {e}")
 
-        # Apply labels to issues
-        for item in report["issues_to_update"]:
-            try:
-                labels = ",".join(item["add_labels"])
-                result = subprocess.run(
-                    ["gh", "issue", "edit", str(item["issue"]),
-                     "--repo", "dirtybirdnj/clood",
-                     "--add-label", labels],
-                    capture_output=True, text=True
-                )
-                if result.returncode == 0:
-                    print(f"  ✓ #{item['issue']}: {labels}")
-                else:
-                    print(f"  ✗ #{item['issue']}: {result.stderr}")
-            except Exception as e:
-                print(f"  ✗ #{item['issue']}: {e}")
+        # Apply labels to issues; each gh call is mostly network wait, so overlap them
+        with ThreadPoolExecutor(max_workers=LABEL_WORKERS) as ex:
+            for line in ex.map(_edit_issue_labels, report["issues_to_update"]):
+                print(line)
 
 
 def main():
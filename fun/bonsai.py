@@ -15,10 +15,12 @@ Usage:
     ./bonsai.py --seed 42 --message "zen"
 """
 
-import argparse
-import sys
 
 def main():
+    # Imported here so listing/importing fun/ doesn't pay for argparse
+    import argparse
+    import sys
+
     parser = argparse.ArgumentParser(description="Generate bonsai trees as SVGs")
     parser.add_argument("-o", "--output", help="Output SVG file")
     parser.add_argument("-L", "--life", type=int, default=32, help="Tree size (0-200)")
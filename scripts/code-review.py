@@ -1,13 +1,20 @@
 #!/usr/bin/env python3
 """Review code at a path using Ollama directly."""
-import sys, os, json, urllib.request, argparse
+import sys, os, re, json, hashlib, argparse
 from pathlib import Path
 
+from ollama_stream import stream_chat
+
 OLLAMA_URL = os.environ.get("OLLAMA_URL", "http://localhost:11434")
 MODEL = os.environ.get("OLLAMA_MODEL", "llama3-groq-tool-use:8b")
 
 EXTENSIONS = {'.py', '.js', '.ts', '.tsx', '.go', '.rs', '.rb', '.sh', '.md', '.json', '.yaml', '.yml', '.toml', '.html', '.css', '.c', '.h', '.cpp', '.hpp', '.java', '.swift', '.kt'}
 SKIP_DIRS = {'.git', 'node_modules', '__pycache__', 'venv', '.venv', 'dist', 'build', 'target', '.claude'}
+CACHE_DIR = Path.home() / ".cache" / "clood-review"
+
+def _cache_file(p: Path, max_size: int) -> Path:
+    key = hashlib.sha1(f"{p.resolve()}\0{max_size}".encode()).hexdigest()
+    return CACHE_DIR / f"{key}.json"
 
 def read_files(path: str, max_size: int = 50000) -> str:
     """Read all code files at path into a single string."""
@@ -21,25 +28,49 @@ def read_files(path: str, max_size: int = 50000) -> str:
     if p.is_file():
         files = [p]
     else:
-        all_files = list(p.rglob('*'))
-        code_files = [f for f in all_files if f.suffix in CODE_FIRST]
-        other_files = [f for f in all_files if f.suffix not in CODE_FIRST]
+        code_files, other_files = [], []
+        for root, dirs, names in os.walk(p):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]  # prune before descending
+            for name in names:
+                suffix = os.path.splitext(name)[1]
+                if suffix in EXTENSIONS:
+                    (code_files if suffix in CODE_FIRST else other_files).append(Path(root, name))
         files = sorted(code_files) + sorted(other_files)
-
-    for f in files:
-        if any(skip in f.parts for skip in SKIP_DIRS):
+    files = [f for f in files if f.suffix in EXTENSIONS and f.is_file()]
+
+    # Reuse the last blob for this path if no candidate file changed since.
+    # ctime catches rewrites that keep mtime (cp -p, a same-tick checkout).
+    stats = [f.stat() for f in files]
+    sig = hashlib.sha1("\n".join(
+        f"{f}\0{st.st_mtime_ns}\0{st.st_ctime_ns}\0{st.st_size}" for f, st in zip(files, stats)
+    ).encode()).hexdigest()
+    cache = _cache_file(p, max_size)
+    try:
+        cached = json.loads(cache.read_text())
+        if cached["sig"] == sig:
+            return cached["blob"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    for f, st in zip(files, stats):
+        # Check the size limit before reading so oversized files cost no I/O
+        if total + st.st_size > max_size:
+            content.append(f"\n### {f} (truncated - size limit)\n")
+            break
+        try:
+            text = f.read_bytes().decode("utf-8", "replace")
+        except OSError:
             continue
-        if f.is_file() and f.suffix in EXTENSIONS:
-            try:
-                text = f.read_text()
-                if total + len(text) > max_size:
-                    content.append(f"\n### {f} (truncated - size limit)\n")
-                    break
-                content.append(f"\n### {f}\n```{f.suffix[1:]}\n{text}\n```\n")
-                total += len(text)
-            except: pass
-
-    return "".join(content) or "No code files found."
+        content.append(f"\n### {f}\n```{f.suffix[1:]}\n{text}\n```\n")
+        total += st.st_size
+
+    blob = "".join(content) or "No code files found."
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache.write_text(json.dumps({"sig": sig, "blob": blob}))
+    except OSError:
+        pass
+    return blob
 
 REVIEW_PROMPT = """Review the following code. Be specific and actionable.
 
@@ -88,37 +119,23 @@ replacement code
 
 ## Your Changes"""
 
-def review(path: str, model: str = MODEL, mode: str = "review") -> str:
-    """Send code to Ollama for review."""
+def review(path: str, model: str = MODEL, mode: str = "review", echo=None) -> str:
+    """Send code to Ollama for review, echoing tokens to `echo` as they stream in."""
     code = read_files(path)
     prompts = {"review": REVIEW_PROMPT, "patch": PATCH_PROMPT, "edit": EDIT_PROMPT}
     prompt = prompts.get(mode, REVIEW_PROMPT).format(code=code)
 
-    payload = {
-        "model": model,
-        "messages": [{"role": "user", "content": prompt}],
-        "stream": False
-    }
-
-    req = urllib.request.Request(
-        f"{OLLAMA_URL}/api/chat",
-        json.dumps(payload).encode(),
-        {"Content-Type": "application/json"}
-    )
-
     print(f"Reviewing {path} with {model}...", file=sys.stderr)
+    return stream_chat(OLLAMA_URL, model, prompt, echo)
 
-    with urllib.request.urlopen(req, timeout=300) as r:
-        resp = json.loads(r.read())
-        return resp.get("message", {}).get("content", "No response")
+_EDIT_BLOCK_RE = re.compile(
+    r'### Change \d+:([^\n]*)\n+<<<<<<< SEARCH\n(.*?)\n=======\n(.*?)\n>>>>>>> REPLACE',
+    re.DOTALL
+)
 
 def apply_edits(path: str, response: str):
     """Parse SEARCH/REPLACE blocks and apply interactively."""
-    import re
-    blocks = re.findall(
-        r'### Change \d+:([^\n]*)\n+<<<<<<< SEARCH\n(.*?)\n=======\n(.*?)\n>>>>>>> REPLACE',
-        response, re.DOTALL
-    )
+    blocks = _EDIT_BLOCK_RE.findall(response)
     if not blocks:
         print("No edit blocks found in response.")
         return
@@ -163,10 +180,10 @@ if __name__ == "__main__":
 
     OLLAMA_URL = args.url
     mode = "edit" if args.edit else ("patch" if args.patch else "review")
-    result = review(args.path, args.model, mode=mode)
+    # Stream straight to the terminal; keep stdout clean when it's redirected
+    live = sys.stdout.isatty()
+    result = review(args.path, args.model, mode=mode, echo=sys.stdout if live else sys.stderr)
 
+    print("" if live else result)
     if args.edit:
-        print(result)
         apply_edits(args.path, result)
-    else:
-        print(result)
@@ -12,10 +12,12 @@ Usage:
     python3 conductor-catfight.py
 """
 
+import http.client
 import json
-import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from urllib.parse import urlsplit
 
 # Configuration
 OLLAMA_URLS = {
@@ -91,11 +93,21 @@ ALWAYS use output_file parameter with delegate_coding."""
 
 TEST_TASK = "Create a hello.html file that displays 'Hello World' in a styled heading"
 
+# One keep-alive connection per host, reused across tests
+_connections = {}
+
+
+def _connection(host: str) -> http.client.HTTPConnection:
+    """Return the persistent connection to a host's Ollama server."""
+    conn = _connections.get(host)
+    if conn is None:
+        url = urlsplit(OLLAMA_URLS[host])
+        conn = _connections[host] = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=60)
+    return conn
+
 
 def test_conductor(model: str, host: str) -> dict:
     """Test a single conductor model."""
-    url = f"{OLLAMA_URLS[host]}/api/chat"
-
     messages = [
         {"role": "system", "content": SYSTEM_PROMPT},
         {"role": "user", "content": TEST_TASK}
@@ -106,22 +118,21 @@ def test_conductor(model: str, host: str) -> dict:
         "messages": messages,
         "tools": TOOLS,
         "stream": False
-    })
+    }).encode()
 
     start = time.time()
+    conn = _connection(host)
 
     try:
-        proc = subprocess.run(
-            ["curl", "-s", "-X", "POST", url,
-             "-H", "Content-Type: application/json",
-             "-d", payload],
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
+        try:
+            conn.request("POST", "/api/chat", payload, {"Content-Type": "application/json"})
+            body = conn.getresponse().read()
+        except Exception:
+            conn.close()  # reconnect on the next request
+            raise
 
         elapsed = time.time() - start
-        result = json.loads(proc.stdout)
+        result = json.loads(body)
         message = result.get("message", {})
         tool_calls = message.get("tool_calls", [])
         content = message.get("content", "")
@@ -182,20 +193,29 @@ def test_conductor(model: str, host: str) -> dict:
         }
 
 
+def _test_host(candidates: list) -> list:
+    """Test one host's models serially so they don't fight over its GPU."""
+    return [test_conductor(model, host) for model, host in candidates]
+
+
 def main():
     print("=" * 70)
     print("  CONDUCTOR CATFIGHT - Testing Orchestrator Models")
     print("=" * 70)
     print(f"\nTask: {TEST_TASK}")
-    print(f"Testing {len(CONDUCTORS)} conductor candidates...\n")
-
-    results = []
 
+    by_host = {}
     for model, host in CONDUCTORS:
-        print(f"Testing {model} on {host}...", end=" ", flush=True)
-        result = test_conductor(model, host)
-        results.append(result)
+        by_host.setdefault(host, []).append((model, host))
+    print(f"Testing {len(CONDUCTORS)} conductor candidates across {len(by_host)} hosts...\n", flush=True)
+
+    # Hosts run in parallel; report in CONDUCTORS order once all are done
+    with ThreadPoolExecutor(max_workers=max(len(by_host), 1)) as pool:
+        per_host = {host: iter(rs) for host, rs in zip(by_host, pool.map(_test_host, by_host.values()))}
+    results = [next(per_host[host]) for _, host in CONDUCTORS]
 
+    for result in results:
+        print(f"Testing {result['model']} on {result['host']}...", end=" ")
         if result.get("error"):
             print(f"ERROR: {result['error'][:50]}")
         else:
@@ -4,31 +4,54 @@ Context-aware ask: Gathers project context, then asks Ollama.
 This is the "conductor" that creates a Claude-like experience by chaining
 context gathering + LLM call.
 """
-import sys, os, json, subprocess, urllib.request, argparse
-from pathlib import Path
+import sys, os, stat, subprocess, argparse
+from concurrent.futures import ThreadPoolExecutor
+
+from ollama_stream import stream_chat
 
 OLLAMA_URL = os.environ.get("OLLAMA_URL", "http://localhost:11434")
 MODEL = os.environ.get("OLLAMA_MODEL", "llama3-groq-tool-use:8b")
 
-def run(cmd: str) -> str:
-    """Run shell command, return output."""
+def run(argv: list) -> str:
+    """Run a command (no shell), return output."""
     try:
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=10)
+        result = subprocess.run(argv, capture_output=True, text=True, timeout=10)
         return result.stdout.strip() or result.stderr.strip()
-    except:
+    except (subprocess.SubprocessError, OSError):
         return ""
 
 def gather_git_context() -> dict:
     """Gather git repository context."""
     ctx = {}
 
-    # Check if we're in a git repo
-    if run("git rev-parse --git-dir 2>/dev/null"):
-        ctx["branch"] = run("git branch --show-current")
-        ctx["status"] = run("git status --short")
-        ctx["recent_commits"] = run("git log --oneline -5")
-        ctx["staged_diff"] = run("git diff --cached --stat")
-        ctx["unstaged_diff"] = run("git diff --stat")
+    # One porcelain v2 call gives the branch headers plus the entries, in a
+    # stable, unlocalized format; outside a repo it prints an error instead
+    status = run(["git", "status", "--porcelain=v2", "--branch"])
+    if not status.startswith("# branch."):
+        return ctx
+
+    headers, entries = {}, []
+    for line in status.splitlines():
+        if line.startswith("# "):
+            key, _, value = line[2:].partition(" ")
+            headers[key] = value
+        elif line[:2] in ("1 ", "2 ", "u "):
+            # "1 XY sub mH mI mW hH hI path", "2 ... path<TAB>orig", "u ... h1 h2 h3 path"
+            fields = line.split(" ", {"1": 8, "2": 9, "u": 10}[line[0]])
+            path, _, orig = fields[-1].partition("\t")
+            entries.append(fields[1].replace(".", " ") + " " + (f"{orig} -> {path}" if orig else path))
+        elif line[:2] in ("? ", "! "):
+            entries.append(line[0] * 2 + line[1:])
+
+    ctx["branch"] = headers.get("branch.head", "")
+    # Shown like `git status --short`: XY, then the path
+    ctx["status"] = "\n".join(entries)
+    if headers.get("branch.oid") != "(initial)":  # an unborn branch has no log yet
+        ctx["recent_commits"] = run(["git", "log", "--oneline", "-5"])
+
+    # XY columns: X is the index (staged) state, Y the worktree state
+    ctx["staged"] = sum(1 for l in entries if l[0] not in " ?!")
+    ctx["unstaged"] = sum(1 for l in entries if l[1] not in " ?!")
 
     return ctx
 
@@ -48,36 +71,55 @@ def gather_file_context(paths: list = None) -> str:
         check_files = paths + check_files
 
     for fname in check_files:
-        p = Path(fname)
-        if p.exists() and p.is_file():
-            try:
-                text = p.read_text()[:2000]  # First 2KB
-                content.append(f"### {fname}\n{text}\n")
-            except:
-                pass
-
-    return "\n".join(content[:3])  # Max 3 files
+        if len(content) >= 3:  # Max 3 files
+            break
+        try:
+            if not stat.S_ISREG(os.stat(fname).st_mode):
+                continue
+            with open(fname, "rb") as f:
+                text = f.read(2000).decode("utf-8", "replace")  # First 2KB
+        except OSError:
+            continue
+        content.append(f"### {fname}\n{text}\n")
+
+    return "\n".join(content)
+
+CODE_EXTS = {'.py', '.rs', '.js', '.ts', '.go'}
+
+def _walk_code_files(root: str = ".", max_depth: int = 2, limit: int = 20) -> list:
+    """Code files up to max_depth levels below root, stopping after limit hits."""
+    found = []
+    stack = [(root, 1)]
+    while stack and len(found) < limit:
+        d, depth = stack.pop()
+        try:
+            with os.scandir(d) as it:
+                for e in it:
+                    if e.is_file() and os.path.splitext(e.name)[1] in CODE_EXTS:
+                        found.append(e.path)
+                        if len(found) >= limit:
+                            break
+                    elif depth < max_depth and e.is_dir(follow_symlinks=False):
+                        stack.append((e.path, depth + 1))
+        except OSError:
+            continue
+    return found
 
 def gather_directory_context() -> str:
     """Get directory structure overview."""
     try:
         # Get top-level structure
-        result = subprocess.run(
-            "find . -maxdepth 2 -type f -name '*.py' -o -name '*.rs' -o -name '*.js' -o -name '*.ts' -o -name '*.go' 2>/dev/null | head -20",
-            shell=True, capture_output=True, text=True
-        )
-        files = result.stdout.strip()
+        files = "\n".join(_walk_code_files())
 
         # Also get directories
-        dirs = run("ls -d */ 2>/dev/null | head -10")
+        with os.scandir(".") as it:
+            dirs = "\n".join(sorted(e.name + "/" for e in it if e.is_dir() and not e.name.startswith("."))[:10])
 
         return f"Directories: {dirs}\n\nCode files:\n{files}"
-    except:
+    except OSError:
         return ""
 
-def ask_ollama(question: str, context: str, model: str) -> str:
-    """Send question with context to Ollama."""
-    prompt = f"""You are a helpful coding assistant. Answer questions about this project using the context provided.
+ASK_PROMPT = """You are a helpful coding assistant. Answer questions about this project using the context provided.
 
 ## Project Context
 {context}
@@ -87,21 +129,11 @@ def ask_ollama(question: str, context: str, model: str) -> str:
 
 ## Answer (be concise and specific)"""
 
-    payload = {
-        "model": model,
-        "messages": [{"role": "user", "content": prompt}],
-        "stream": False
-    }
-
-    req = urllib.request.Request(
-        f"{OLLAMA_URL}/api/chat",
-        json.dumps(payload).encode(),
-        {"Content-Type": "application/json"}
-    )
+def ask_ollama(question: str, context: str, model: str, echo=None) -> str:
+    """Send question with context to Ollama, echoing tokens to `echo` as they stream in."""
+    prompt = ASK_PROMPT.format(context=context, question=question)
 
-    with urllib.request.urlopen(req, timeout=300) as r:
-        resp = json.loads(r.read())
-        return resp.get("message", {}).get("content", "No response")
+    return stream_chat(OLLAMA_URL, model, prompt, echo)
 
 def main():
     parser = argparse.ArgumentParser(description="Ask questions with project context")
@@ -117,9 +149,12 @@ def main():
     # Gather context from multiple sources
     print("Gathering context...", file=sys.stderr)
 
-    git_ctx = gather_git_context()
-    file_ctx = gather_file_context(args.files)
-    dir_ctx = gather_directory_context()
+    # Independent sources - overlap the git/find subprocesses and file reads
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        git_f = pool.submit(gather_git_context)
+        file_f = pool.submit(gather_file_context, args.files)
+        dir_f = pool.submit(gather_directory_context)
+        git_ctx, file_ctx, dir_ctx = git_f.result(), file_f.result(), dir_f.result()
 
     # Build context string
     context_parts = []
@@ -150,7 +185,8 @@ Recent commits:
         print("------------------------", file=sys.stderr)
 
     print(f"Asking {args.model}...", file=sys.stderr)
-    print(ask_ollama(question, full_context, args.model))
+    ask_ollama(question, full_context, args.model, echo=sys.stdout)
+    print()
 
 if __name__ == "__main__":
     main()
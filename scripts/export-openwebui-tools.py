@@ -12,58 +12,52 @@ import sys
 import os
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional - stdlib json works, just slower on big tables
+    orjson = None
+
+def _dump_json(row: dict) -> bytes:
+    """Pretty-print a row as JSON bytes in one encode."""
+    if orjson:
+        return orjson.dumps(row, option=orjson.OPT_INDENT_2, default=str)
+    return json.dumps(row, indent=2, default=str, ensure_ascii=False).encode()
+
+def _export_row(row: dict, output_path: Path, stem: str, kind: str):
+    """Write one row as <stem>.json, plus <stem>.py when it carries code."""
+    json_path = output_path / f"{stem}.json"
+    json_path.write_bytes(_dump_json(row))
+    print(f"  Exported: {json_path}")
+
+    # If there's content/code, save it separately as .py for readability
+    content = row.get('content') or row.get('code')
+    if content:
+        py_path = output_path / f"{stem}.py"
+        header = f"# {kind}: {row.get('name', row.get('id', 'unknown'))}\n# Exported from open-webui\n\n"
+        py_path.write_bytes((header + content).encode())
+        print(f"  Exported: {py_path}")
+
 def export_tools(db_path: str, output_dir: str):
-    conn = sqlite3.connect(db_path)
+    # Read-only: never takes a write lock or creates a journal next to the copy
+    conn = sqlite3.connect(Path(db_path).resolve().as_uri() + "?mode=ro", uri=True)
     conn.row_factory = sqlite3.Row
 
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
 
-    # Export tools
-    tools = conn.execute("SELECT * FROM tool").fetchall()
-    print(f"Found {len(tools)} tools")
+    # Export tools (streamed from the cursor - one row in memory at a time)
+    print(f"Found {conn.execute('SELECT COUNT(*) FROM tool').fetchone()[0]} tools")
 
-    for tool in tools:
+    for tool in conn.execute("SELECT * FROM tool"):
         tool_dict = dict(tool)
-        tool_id = tool_dict.get('id', 'unknown')
-
-        # Save as JSON for full metadata
-        json_path = output_path / f"{tool_id}.json"
-        with open(json_path, 'w') as f:
-            json.dump(tool_dict, f, indent=2, default=str)
-        print(f"  Exported: {json_path}")
-
-        # If there's content/code, save it separately as .py for readability
-        content = tool_dict.get('content') or tool_dict.get('code')
-        if content:
-            py_path = output_path / f"{tool_id}.py"
-            with open(py_path, 'w') as f:
-                f.write(f"# Tool: {tool_dict.get('name', tool_id)}\n")
-                f.write(f"# Exported from open-webui\n\n")
-                f.write(content)
-            print(f"  Exported: {py_path}")
+        _export_row(tool_dict, output_path, tool_dict.get('id', 'unknown'), "Tool")
 
     # Export functions
-    functions = conn.execute("SELECT * FROM function").fetchall()
-    print(f"Found {len(functions)} functions")
+    print(f"Found {conn.execute('SELECT COUNT(*) FROM function').fetchone()[0]} functions")
 
-    for func in functions:
+    for func in conn.execute("SELECT * FROM function"):
         func_dict = dict(func)
-        func_id = func_dict.get('id', 'unknown')
-
-        json_path = output_path / f"function_{func_id}.json"
-        with open(json_path, 'w') as f:
-            json.dump(func_dict, f, indent=2, default=str)
-        print(f"  Exported: {json_path}")
-
-        content = func_dict.get('content') or func_dict.get('code')
-        if content:
-            py_path = output_path / f"function_{func_id}.py"
-            with open(py_path, 'w') as f:
-                f.write(f"# Function: {func_dict.get('name', func_id)}\n")
-                f.write(f"# Exported from open-webui\n\n")
-                f.write(content)
-            print(f"  Exported: {py_path}")
+        _export_row(func_dict, output_path, f"function_{func_dict.get('id', 'unknown')}", "Function")
 
     conn.close()
     print(f"\nExport complete. Files saved to {output_path}")
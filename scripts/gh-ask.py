@@ -1,76 +1,102 @@
 #!/usr/bin/env python3
 """Query GitHub repos with gh CLI, feed to Ollama."""
-import sys, json, subprocess, urllib.request, argparse
+import sys, json, shutil, subprocess, argparse
+
+from ollama_stream import stream_chat
 
 OLLAMA_URL = "http://localhost:11434"
 MODEL = "llama3-groq-tool-use:8b"
 
-def gh(cmd: str) -> str:
-    """Run gh command and return output."""
-    result = subprocess.run(f"gh {cmd}", shell=True, capture_output=True, text=True)
+GH = shutil.which("gh")  # resolved once; None skips the calls entirely
+
+def gh(argv: list) -> str:
+    """Run gh with argv (no shell) and return output."""
+    if not GH:
+        return "gh unavailable"
+    try:
+        result = subprocess.run([GH, *argv], capture_output=True, text=True, timeout=15)
+    except subprocess.TimeoutExpired:
+        return "gh timed out"
     return result.stdout or result.stderr
 
+# Everything gather_context needs in one round trip, trimmed to the fields
+# the prompt uses; newest-first to match `gh issue list` / `gh pr list`
+GH_CONTEXT_QUERY = """
+query($owner: String!, $name: String!) {
+  repository(owner: $owner, name: $name) {
+    name description stargazerCount forkCount primaryLanguage { name }
+    issues(first: 10, states: OPEN, orderBy: {field: CREATED_AT, direction: DESC}) {
+      nodes { number title state author { login } }
+    }
+    pullRequests(first: 10, states: OPEN, orderBy: {field: CREATED_AT, direction: DESC}) {
+      nodes { number title state isDraft author { login } }
+    }
+    defaultBranchRef { target { ... on Commit { history(first: 5) { nodes { message } } } } }
+  }
+}"""
+
 def gather_context(repo: str = None) -> dict:
     """Gather context from gh CLI."""
-    ctx = {}
-
-    # If repo specified, set it
-    prefix = f"-R {repo} " if repo else ""
-
-    # Recent issues
-    ctx["issues"] = gh(f"{prefix}issue list --limit 10 --json number,title,state,author")
-
-    # Recent PRs
-    ctx["prs"] = gh(f"{prefix}pr list --limit 10 --json number,title,state,author,isDraft")
-
-    # Repo info
     if repo:
-        ctx["repo"] = gh(f"repo view {repo} --json name,description,stargazerCount,forkCount,primaryLanguage")
+        # OWNER/REPO or HOST/OWNER/REPO, as gh's own --repo accepts
+        parts = repo.split("/")
+        if len(parts) not in (2, 3) or not all(parts):
+            out = f"invalid repo {repo!r} (expected OWNER/REPO or HOST/OWNER/REPO)"
+            return {"issues": out, "prs": out, "repo": out, "commits": "N/A"}
+        *host, owner, name = parts
+        # -f passes values as strings; -F would turn a repo named "123" or "true" into a number/bool
+        fields = ["-f", f"owner={owner}", "-f", f"name={name}"] + (["--hostname", host[0]] if host else [])
     else:
-        ctx["repo"] = gh("repo view --json name,description,stargazerCount,forkCount,primaryLanguage")
-
-    # Recent commits
-    ctx["commits"] = gh(f"{prefix}api repos/:owner/:repo/commits --jq '.[0:5] | .[] | .commit.message' 2>/dev/null") or "N/A"
+        # Only -F expands the {owner}/{repo} placeholders from the current checkout
+        fields = ["-F", "owner={owner}", "-F", "name={repo}"]
+    out = gh(["api", "graphql", "-f", f"query={GH_CONTEXT_QUERY}", *fields])
+
+    try:
+        r = json.loads(out)["data"]["repository"]
+    except (ValueError, KeyError, TypeError):
+        r = None
+    if not r:  # gh/GraphQL error - surface it the way the per-call version did
+        return {"issues": out, "prs": out, "repo": out, "commits": "N/A"}
+
+    branch = r.pop("defaultBranchRef") or {}
+    history = branch.get("target", {}).get("history", {}).get("nodes", [])
+    return {
+        "issues": json.dumps(r.pop("issues")["nodes"]),
+        "prs": json.dumps(r.pop("pullRequests")["nodes"]),
+        "repo": json.dumps(r),
+        "commits": "\n".join(c["message"] for c in history) or "N/A",
+    }
 
-    return ctx
+ASK_PROMPT = """You are a GitHub assistant. Answer questions about this repository.
 
-def ask(question: str, context: dict, model: str, ollama_url: str) -> str:
-    """Ask Ollama with GitHub context."""
-    ctx_text = f"""## Repository Info
-{context.get('repo', 'N/A')}
+## Repository Info
+{repo}
 
 ## Recent Issues
-{context.get('issues', 'None')}
+{issues}
 
 ## Recent PRs
-{context.get('prs', 'None')}
+{prs}
 
 ## Recent Commits
-{context.get('commits', 'N/A')}"""
-
-    prompt = f"""You are a GitHub assistant. Answer questions about this repository.
-
-{ctx_text}
+{commits}
 
 ## Question
 {question}
 
 ## Answer"""
 
-    payload = {
-        "model": model,
-        "messages": [{"role": "user", "content": prompt}],
-        "stream": False
-    }
-
-    req = urllib.request.Request(
-        f"{ollama_url}/api/chat",
-        json.dumps(payload).encode(),
-        {"Content-Type": "application/json"}
+def ask(question: str, context: dict, model: str, ollama_url: str, echo=None) -> str:
+    """Ask Ollama with GitHub context, echoing tokens to `echo` as they stream in."""
+    prompt = ASK_PROMPT.format(
+        repo=context.get('repo', 'N/A'),
+        issues=context.get('issues', 'None'),
+        prs=context.get('prs', 'None'),
+        commits=context.get('commits', 'N/A'),
+        question=question,
     )
 
-    with urllib.request.urlopen(req, timeout=300) as r:
-        return json.loads(r.read()).get("message", {}).get("content", "No response")
+    return stream_chat(ollama_url, model, prompt, echo)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Ask questions about GitHub repos")
@@ -88,4 +114,5 @@ if __name__ == "__main__":
         print(json.dumps(ctx, indent=2))
     else:
         print(f"🤖 Asking {args.model}...", file=sys.stderr)
-        print(ask(" ".join(args.question), ctx, args.model, args.ollama))
+        ask(" ".join(args.question), ctx, args.model, args.ollama, echo=sys.stdout)
+        print()
@@ -0,0 +1,42 @@
+"""Streaming Ollama chat shared by the *-ask.py and code-review.py scripts."""
+import sys, io, json, urllib.request
+
+def stream_chat(ollama_url: str, model: str, prompt: str, echo=None, timeout: int = 300) -> str:
+    """Send one user prompt to /api/chat and return the reply, echoing tokens to `echo` as they stream in.
+
+    An `error` line or a stream that ends before `done` is reported on stderr;
+    whatever arrived before it is still returned.
+    """
+    payload = {
+        "model": model,
+        "messages": [{"role": "user", "content": prompt}],
+        "stream": True
+    }
+
+    req = urllib.request.Request(
+        f"{ollama_url}/api/chat",
+        json.dumps(payload, ensure_ascii=False).encode(),
+        {"Content-Type": "application/json"}
+    )
+
+    buf = io.StringIO()
+    done = False
+    with urllib.request.urlopen(req, timeout=timeout) as r:
+        for line in r:
+            if not line.strip():
+                continue
+            chunk = json.loads(line)
+            if "error" in chunk:
+                print(f"\nOllama error: {chunk['error']}", file=sys.stderr)
+                return buf.getvalue() or f"Ollama error: {chunk['error']}"
+            token = chunk.get("message", {}).get("content", "")
+            buf.write(token)
+            if echo:
+                echo.write(token)
+                echo.flush()
+            if chunk.get("done"):
+                done = True
+                break
+    if not done:
+        print("\nOllama stream ended before the reply was done", file=sys.stderr)
+    return buf.getvalue() or "No response"
@@ -9,10 +9,16 @@ This runs on ubuntu25 and coordinates the server garden.
 """
 
 import json
+import queue
 import subprocess
 import requests
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Configuration
 ORCHESTRATOR_URL = "http://localhost:11434"  # Ollama on ubuntu25
@@ -41,8 +47,23 @@ CODER_HOSTS = {
 # Default coder settings - can be overridden via CLI
 CODER_HOST = "mac-laptop"  # Use laptop's big GPU by default
 CODER_MODEL = "qwen2.5-coder:32b"  # Biggest coder model on laptop
+
+# With --race, delegate_coding sends the same prompt to each of these hosts
+# (same CODER_MODEL) and keeps whichever answers first
+RACE = False
+RACE_HOSTS = ["mac-laptop", "mac-mini"]
 WORKSPACE = Path("/data/repos/workspace")  # Where code lives on ubuntu25
 
+# (connect, read) timeout per delegate attempt - a stalled coder gets retried
+# instead of burning the whole budget on one hung request
+DELEGATE_TIMEOUT = (10, 150)
+DELEGATE_RETRIES = 2
+
+# Shared keep-alive pool so the agent loop reuses sockets to each host
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=8, pool_maxsize=8,
+                                     max_retries=Retry(total=2, backoff_factor=0.2)))
+
 # Tool definitions (OpenAI function calling format)
 TOOLS = [
     {
@@ -96,6 +117,21 @@ TOOLS = [
             "parameters": {"type": "object", "properties": {}}
         }
     },
+    {
+        "type": "function",
+        "function": {
+            "name": "gather_context",
+            "description": "Read several files and optionally git status in one call. Prefer this over repeated read_file calls.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "paths": {"type": "array", "items": {"type": "string"}, "description": "File paths (relative to workspace)"},
+                    "include_git": {"type": "boolean", "description": "Also include git status"}
+                },
+                "required": ["paths"]
+            }
+        }
+    },
     {
         "type": "function",
         "function": {
@@ -150,26 +186,139 @@ TOOLS = [
 ]
 
 
+# Kept byte-identical as messages[0] on every call so Ollama can reuse the
+# cached prompt prefix between iterations instead of re-evaluating it.
+# Compaction (below) rewrites everything after the task, so only this prompt
+# and the task survive it in the cache; it runs in big steps so the turns in
+# between are pure appends that reuse the whole prefix.
+SYSTEM_PROMPT = """You are an AI coding agent. You MUST use tools to complete tasks.
+
+IMPORTANT: When creating files, ALWAYS use delegate_coding with output_file parameter.
+This automatically saves the code - no separate write_file needed.
+
+Example - to create todo.html:
+  delegate_coding(prompt="Create a todo list HTML", output_file="todo.html")
+  task_complete(summary="Created todo.html")
+
+Available tools:
+- delegate_coding(prompt, output_file): Generate AND save code in one step
+- read_file(path): Read a file
+- gather_context(paths, include_git): Read several files (and git status) at once - prefer over multiple read_file calls
+- git_commit(message): Commit changes
+- task_complete(summary): Signal done
+
+DO NOT call write_file after delegate_coding - use output_file instead."""
+
+# Large enough that tool results don't push the conversation past the window;
+# a context shift would truncate the prefix and throw that cache away
+ORCHESTRATOR_NUM_CTX = 8192
+
+# History compaction: past MAX_MESSAGES, everything between the task and the
+# last KEEP_RECENT messages is folded into one short summary message.
+# KEEP_RECENT is well below MAX_MESSAGES so a compaction buys several
+# append-only turns before the next one; the cost is that fewer recent turns
+# stay verbatim right after it (older tool output survives only in the summary)
+MAX_MESSAGES = 12
+KEEP_RECENT = 2
+SUMMARY_PREFIX = "Prior context summary: "
+SUMMARY_CHARS = 1024
+SUMMARY_PART_CHARS = 256  # per dropped tool result
+
+# Tools with no side effects - safe to run concurrently within one turn
+READ_ONLY_TOOLS = {"read_file", "list_directory", "git_status", "gather_context"}
+
+# Per-run caches: file text keyed by path and validated by (mtime, size);
+# git status is reused until a tool that can change the tree runs
+_FILE_CACHE = {}
+_GIT_STATUS = None
+
+
+def _strip_fences(content: str) -> str:
+    """Strip a surrounding markdown code fence, if present."""
+    if not content.startswith("```"):
+        return content
+    # Slice around the fence lines rather than splitting every line
+    body = content[content.find("\n") + 1:] if "\n" in content else ""
+    tail = body.rstrip()
+    last_nl = tail.rfind("\n")
+    if tail[last_nl + 1:].startswith("```"):
+        return tail[:max(last_nl, 0)]
+    return body
+
+
+def _generate_code(prompt: str, host: str = None, model: str = None) -> str:
+    """Have a coder host generate code for prompt, fences stripped.
+
+    Blocking and self-contained so callers can fan requests out across
+    CODER_HOSTS on threads; the pooled SESSION is shared safely.
+    """
+    url = f"{CODER_HOSTS[host or CODER_HOST]}/api/generate"
+    payload = {
+        "model": model or CODER_MODEL,
+        "prompt": f"You are an expert programmer. Output only clean, working code with no explanations.\n\n{prompt}",
+        "stream": False
+    }
+    for attempt in range(DELEGATE_RETRIES):
+        try:
+            resp = SESSION.post(url, json=payload, timeout=DELEGATE_TIMEOUT)
+            resp.raise_for_status()
+            break
+        except (requests.Timeout, requests.ConnectionError):
+            if attempt == DELEGATE_RETRIES - 1:
+                raise
+    return _strip_fences(resp.json().get("response", ""))
+
+
+def _race_generate(prompt: str) -> str:
+    """First successful _generate_code result across RACE_HOSTS.
+
+    Racers run on daemon threads: the loser is abandoned rather than
+    waited on, and can't hold up interpreter exit.
+    """
+    results = queue.Queue()
+
+    def racer(host):
+        try:
+            results.put((True, _generate_code(prompt, host)))
+        except Exception as e:
+            results.put((False, e))
+
+    for host in RACE_HOSTS:
+        threading.Thread(target=racer, args=(host,), daemon=True).start()
+
+    error = None
+    for _ in RACE_HOSTS:
+        ok, value = results.get()
+        if ok:
+            return value
+        error = value
+    raise error
+
+
 def execute_tool(name: str, args: dict) -> str:
     """Execute a tool and return the result."""
+    global _GIT_STATUS
 
     if name == "read_file":
         path = WORKSPACE / args["path"]
-        if not path.exists():
+        try:
+            st = path.stat()
+        except OSError:
             return f"Error: File not found: {args['path']}"
-        return path.read_text()
+        sig = (st.st_mtime_ns, st.st_size)
+        cached = _FILE_CACHE.get(path)
+        if cached is None or cached[0] != sig:
+            cached = _FILE_CACHE[path] = (sig, path.read_text())
+        return cached[1]
 
     elif name == "write_file":
         # Handle paths - strip leading slash and any absolute path attempts
         file_path = args["path"].lstrip("/").split("/")[-1]  # Just get filename
         path = WORKSPACE / file_path
         path.parent.mkdir(parents=True, exist_ok=True)
-        # Strip markdown code fences if present
-        content = args["content"]
-        if content.startswith("```"):
-            lines = content.split("\n")
-            content = "\n".join(lines[1:-1] if lines[-1].startswith("```") else lines[1:])
+        content = _strip_fences(args["content"])
         path.write_text(content)
+        _GIT_STATUS = None
         return f"Successfully wrote {len(content)} bytes to {file_path}"
 
     elif name == "list_directory":
@@ -180,15 +329,29 @@ def execute_tool(name: str, args: dict) -> str:
         return "\n".join(f.name for f in files)
 
     elif name == "git_status":
-        result = subprocess.run(
-            ["git", "status", "--short"],
-            cwd=WORKSPACE,
-            capture_output=True,
-            text=True
-        )
-        return result.stdout or "Nothing to commit, working tree clean"
+        if _GIT_STATUS is None:
+            result = subprocess.run(
+                ["git", "status", "--short"],
+                cwd=WORKSPACE,
+                capture_output=True,
+                text=True
+            )
+            _GIT_STATUS = result.stdout or "Nothing to commit, working tree clean"
+        return _GIT_STATUS
+
+    elif name == "gather_context":
+        # One round trip for what would otherwise be several tool calls
+        files = {}
+        for rel in args.get("paths", []):
+            if (WORKSPACE / rel).is_file():
+                files[rel] = execute_tool("read_file", {"path": rel})
+        bundle = {"files": files}
+        if args.get("include_git"):
+            bundle["git"] = execute_tool("git_status", {})
+        return json.dumps(bundle)
 
     elif name == "git_commit":
+        _GIT_STATUS = None
         # Stage all changes
         subprocess.run(["git", "add", "-A"], cwd=WORKSPACE)
         # Commit
@@ -213,32 +376,21 @@ def execute_tool(name: str, args: dict) -> str:
         prompt = args["prompt"]
         output_file = args.get("output_file")
 
-        # Call mac-laptop's big models for heavy coding
-        url = f"{CODER_HOSTS['mac-laptop']}/api/generate"
-        payload = {
-            "model": CODER_MODEL,  # qwen2.5-coder:32b
-            "prompt": f"You are an expert programmer. Output only clean, working code with no explanations.\n\n{prompt}",
-            "stream": False
-        }
+        # Call the coder host's big models for heavy coding
         try:
-            resp = requests.post(url, json=payload, timeout=300)  # Longer timeout for big models
-            result = resp.json()
-            code = result.get("response", "")
-
-            # Strip markdown code fences if present
-            if code.startswith("```"):
-                lines = code.split("\n")
-                code = "\n".join(lines[1:-1] if lines[-1].startswith("```") else lines[1:])
+            code = _race_generate(prompt) if RACE else _generate_code(prompt)
 
             # Auto-save if output_file specified
             if output_file:
                 path = WORKSPACE / output_file.lstrip("/").split("/")[-1]
                 path.write_text(code)
+                _GIT_STATUS = None
                 return f"Generated and saved {len(code)} bytes to {output_file}"
 
             return code
         except Exception as e:
-            return f"Error calling mac-laptop ({CODER_MODEL}): {e}"
+            hosts = ", ".join(RACE_HOSTS) if RACE else CODER_HOST
+            return f"Error calling {hosts} ({CODER_MODEL}): {e}"
 
     elif name == "task_complete":
         return f"TASK_COMPLETE: {args['summary']}"
@@ -246,6 +398,40 @@ def execute_tool(name: str, args: dict) -> str:
     return f"Unknown tool: {name}"
 
 
+def _execute_reads(calls: list) -> list:
+    """Run read-only (name, args) calls concurrently, once per distinct call."""
+    keys = [(name, json.dumps(args, sort_keys=True, default=str)) for name, args in calls]
+    unique = {}
+    for key, call in zip(keys, calls):
+        unique.setdefault(key, call)
+    if len(unique) == 1:
+        results = {key: execute_tool(*call) for key, call in unique.items()}
+    else:
+        with ThreadPoolExecutor(max_workers=min(4, len(unique))) as pool:
+            results = dict(zip(unique, pool.map(lambda call: execute_tool(*call), unique.values())))
+    return [results[key] for key in keys]
+
+
+def _compact_messages(messages: list):
+    """Fold older turns into one summary so each request stays bounded."""
+    if len(messages) <= MAX_MESSAGES:
+        return
+    cut = len(messages) - KEEP_RECENT
+    # Don't orphan tool results from the assistant turn that requested them
+    while cut > 2 and messages[cut].get("role") == "tool":
+        cut -= 1
+    dropped = messages[2:cut]  # keep the system prompt and the task itself
+    if not dropped:
+        return
+    # Cap each result so one big read can't crowd out the rest, and keep the
+    # tail so the newest dropped results survive once the summary is full
+    parts = [m.get("content", "").removeprefix(SUMMARY_PREFIX) if m.get("role") != "tool"
+             else m.get("content", "")[:SUMMARY_PART_CHARS]
+             for m in dropped
+             if m.get("role") == "tool" or m.get("content", "").startswith(SUMMARY_PREFIX)]
+    messages[2:cut] = [{"role": "user", "content": SUMMARY_PREFIX + "\n".join(parts)[-SUMMARY_CHARS:]}]
+
+
 def call_orchestrator(messages: list, model: str = None) -> dict:
     """Call the orchestrator model with tools."""
     model = model or ORCHESTRATOR_MODEL
@@ -255,13 +441,15 @@ def call_orchestrator(messages: list, model: str = None) -> dict:
         "model": model,
         "messages": messages,
         "tools": TOOLS,
-        "stream": False
+        "stream": False,
+        "options": {"num_ctx": ORCHESTRATOR_NUM_CTX},
+        "keep_alive": "10m",  # stay loaded (with its cache) across delegations
     }
 
-    resp = requests.post(
+    resp = SESSION.post(
         f"{ORCHESTRATOR_URL}/api/chat",
         json=payload,
-        timeout=60
+        timeout=(10, 60)
     )
 
     return resp.json()
@@ -279,22 +467,7 @@ def run_agent(task: str, max_iterations: int = 10, conductor: str = None):
     messages = [
         {
             "role": "system",
-            "content": """You are an AI coding agent. You MUST use tools to complete tasks.
-
-IMPORTANT: When creating files, ALWAYS use delegate_coding with output_file parameter.
-This automatically saves the code - no separate write_file needed.
-
-Example - to create todo.html:
-  delegate_coding(prompt="Create a todo list HTML", output_file="todo.html")
-  task_complete(summary="Created todo.html")
-
-Available tools:
-- delegate_coding(prompt, output_file): Generate AND save code in one step
-- read_file(path): Read a file
-- git_commit(message): Commit changes
-- task_complete(summary): Signal done
-
-DO NOT call write_file after delegate_coding - use output_file instead."""
+            "content": SYSTEM_PROMPT
         },
         {"role": "user", "content": task}
     ]
@@ -302,6 +475,7 @@ DO NOT call write_file after delegate_coding - use output_file instead."""
     for i in range(max_iterations):
         print(f"--- Iteration {i+1} ---")
 
+        _compact_messages(messages)
         response = call_orchestrator(messages, model)
         message = response.get("message", {})
 
@@ -332,6 +506,7 @@ DO NOT call write_file after delegate_coding - use output_file instead."""
         # Execute tool calls
         messages.append(message)
 
+        calls = []
         for tool_call in tool_calls:
             func = tool_call.get("function", {})
             name = func.get("name", "")
@@ -343,22 +518,30 @@ DO NOT call write_file after delegate_coding - use output_file instead."""
                     args = json.loads(args)
                 except:
                     args = {}
+            calls.append((name, args))
 
-            print(f"  Tool: {name}({json.dumps(args)[:100]}...)")
+        # Runs of read-only calls are fetched together up front; anything
+        # that mutates executes one at a time, in order, as before
+        for read_only, group in groupby(calls, key=lambda c: c[0] in READ_ONLY_TOOLS):
+            group = list(group)
+            prefetched = _execute_reads(group) if read_only else None
 
-            result = execute_tool(name, args)
+            for j, (name, args) in enumerate(group):
+                print(f"  Tool: {name}({json.dumps(args)[:100]}...)")
 
-            if "TASK_COMPLETE" in result:
-                print(f"\n✓ {result}")
-                return
+                result = prefetched[j] if read_only else execute_tool(name, args)
 
-            print(f"  Result: {result[:200]}{'...' if len(result) > 200 else ''}")
+                if "TASK_COMPLETE" in result:
+                    print(f"\n✓ {result}")
+                    return
 
-            # Add tool result to messages
-            messages.append({
-                "role": "tool",
-                "content": result
-            })
+                print(f"  Result: {result[:200]}{'...' if len(result) > 200 else ''}")
+
+                # Add tool result to messages
+                messages.append({
+                    "role": "tool",
+                    "content": result
+                })
 
     print("\n⚠ Max iterations reached")
 
@@ -385,7 +568,11 @@ Examples:
     parser.add_argument("--max-iterations", "-m", type=int, default=10,
                        help="Max iterations (default: 10)")
 
+    parser.add_argument("--race", action="store_true",
+                       help=f"Race delegate_coding across {', '.join(RACE_HOSTS)}, keep the first answer")
+
     args = parser.parse_args()
+    RACE = args.race
 
     if not args.task:
         parser.print_help()
@@ -2,6 +2,8 @@
 """Search SearXNG, feed results to Ollama, get answer."""
 import sys, json, urllib.request, urllib.parse, argparse
 
+from ollama_stream import stream_chat
+
 SEARXNG_URL = "http://192.168.4.63:8888"
 OLLAMA_URL = "http://localhost:11434"
 MODEL = "llama3-groq-tool-use:8b"
@@ -24,39 +26,26 @@ def search(query: str, num_results: int = 5) -> list:
         })
     return results
 
-def ask(query: str, context: list, model: str = MODEL, ollama_url: str = None) -> str:
-    """Ask Ollama with search context."""
-    context_text = "\n\n".join([
-        f"**{r['title']}**\n{r['url']}\n{r['content']}"
-        for r in context
-    ])
-
-    prompt = f"""Answer the question using the search results below.
+ASK_PROMPT = """Answer the question using the search results below.
 
 ## Search Results
-{context_text}
+{context}
 
 ## Question
 {query}
 
 ## Your Answer (cite sources with URLs)"""
 
-    payload = {
-        "model": model,
-        "messages": [{"role": "user", "content": prompt}],
-        "stream": False
-    }
+def ask(query: str, context: list, model: str = MODEL, ollama_url: str = None, echo=None) -> str:
+    """Ask Ollama with search context, echoing tokens to `echo` as they stream in."""
+    context_text = "\n\n".join([
+        f"**{r['title']}**\n{r['url']}\n{r['content']}"
+        for r in context
+    ])
 
-    url = ollama_url or OLLAMA_URL
-    req = urllib.request.Request(
-        f"{url}/api/chat",
-        json.dumps(payload).encode(),
-        {"Content-Type": "application/json"}
-    )
+    prompt = ASK_PROMPT.format(context=context_text, query=query)
 
-    with urllib.request.urlopen(req, timeout=300) as r:
-        resp = json.loads(r.read())
-        return resp.get("message", {}).get("content", "No response")
+    return stream_chat(ollama_url or OLLAMA_URL, model, prompt, echo)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Search + Ask with local LLM")
@@ -78,4 +67,5 @@ if __name__ == "__main__":
             print(f"\n{r['title']}\n{r['url']}\n{r['content'][:200]}...")
     else:
         print(f"🤖 Asking {args.model} @ {args.ollama}...", file=sys.stderr)
-        print(ask(query, results, args.model, args.ollama))
+        ask(query, results, args.model, args.ollama, echo=sys.stdout)
+        print()
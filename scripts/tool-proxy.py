@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 """Proxy that injects tools into Ollama API requests."""
-from http.server import HTTPServer, BaseHTTPRequestHandler
-import json, urllib.request
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from concurrent.futures import Future
+from urllib.parse import urlsplit
+import hashlib, http.client, json, queue, re, threading
 
 OLLAMA = "http://localhost:11434"
 TOOLS = [
@@ -16,33 +18,185 @@ TOOLS = [
         "parameters": {"type": "object", "properties": {"query": {"type": "string"}}, "required": ["query"]}}},
 ]
 
+TOOLS_JSON_FRAGMENT = b'"tools":' + json.dumps(TOOLS).encode()
+TOOL_PATHS = ('/v1/chat/completions', '/api/chat')
+MAX_BUFFERED_BODY = 1 << 20  # bigger bodies are streamed to Ollama untouched
+
+def inject_tools(raw):
+    """Return raw with TOOLS added, or None if the request already has tools."""
+    if b'"tools"' in raw:
+        # could be a tools key or just text mentioning it - only a parse can tell
+        body = json.loads(raw)
+        if 'tools' in body:
+            return None
+        body['tools'] = TOOLS
+        return json.dumps(body).encode()
+    head = raw.rstrip()
+    if not head.endswith(b'}'):
+        json.loads(raw)  # not an object - let the decoder report it
+        return None
+    head = head[:-1].rstrip()
+    # splice the pre-encoded tools in before the closing brace
+    return head + (b'' if head.endswith(b'{') else b',') + TOOLS_JSON_FRAGMENT + b'}'
+
+# quotes inside JSON strings are escaped, so this only matches a real key
+STREAM_OFF = re.compile(rb'"stream"\s*:\s*false')
+_inflight = {}  # (path, sha1 of body) -> Future of (status, headers, data)
+_inflight_lock = threading.Lock()
+
+# hop-by-hop headers, plus the two send_response() writes itself
+SKIP_HEADERS = frozenset({
+    'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization',
+    'te', 'trailer', 'transfer-encoding', 'upgrade', 'date', 'server',
+})
+
+_upstream_addr = urlsplit(OLLAMA)
+# idle keep-alive connections to Ollama, shared by every handler thread; each client
+# connection gets its own short-lived thread, so a per-thread connection would never be reused
+_pool = queue.LifoQueue(maxsize=8)
+
+def upstream(method, path, body=None, headers={}, fresh=False):
+    """Send a request to Ollama on a pooled connection; returns (conn, response).
+
+    Hand the pair back with release() once the response has been read.
+    """
+    conn, reused = None, False
+    if not fresh:
+        try:
+            conn, reused = _pool.get_nowait(), True
+        except queue.Empty:
+            pass
+    if conn is None:
+        conn = http.client.HTTPConnection(_upstream_addr.hostname, _upstream_addr.port or 80)
+    try:
+        conn.request(method, path, body, headers)
+        return conn, conn.getresponse()
+    except (http.client.HTTPException, OSError):
+        conn.close()
+        if not reused:
+            raise
+    # Ollama dropped the idle keep-alive connection - retry on another one
+    return upstream(method, path, body, headers)
+
+def release(conn, r):
+    """Pool the connection if its response was fully drained, otherwise discard it."""
+    if r.length == 0:
+        r.close()  # read1() doesn't mark a fully read Content-Length body as done
+    if r.isclosed() and not r.will_close:
+        try:
+            _pool.put_nowait(conn)
+            return
+        except queue.Full:
+            pass
+    conn.close()
+
 class Proxy(BaseHTTPRequestHandler):
-    def do_POST(self):
-        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
-        if 'tools' not in body and self.path in ['/v1/chat/completions', '/api/chat']:
-            body['tools'] = TOOLS
-            print(f"[proxy] Injected {len(TOOLS)} tools")
-        req = urllib.request.Request(OLLAMA + self.path, json.dumps(body).encode(),
-            {'Content-Type': 'application/json'})
+    disable_nagle_algorithm = True  # streamed tokens go out as they arrive
+
+    def start_response(self, status, headers):
+        """Send Ollama's status and end-to-end headers to the client."""
+        self.send_response(status)
+        for name, value in headers:
+            if name.lower() not in SKIP_HEADERS:
+                self.send_header(name, value)
+        self.end_headers()  # no Content-Length: HTTP/1.0 close marks the end
+
+    def relay(self, conn, r):
+        """Pass the upstream response through, body streamed as it arrives."""
         try:
-            with urllib.request.urlopen(req) as r:
-                data = r.read()
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
+            self.start_response(r.status, r.getheaders())
+            # read1 returns whatever is buffered instead of waiting for a full 64K
+            while chunk := r.read1(65536):
+                self.wfile.write(chunk)
+                self.wfile.flush()
+        except OSError:
+            pass  # client hung up mid-stream; release() drops the undrained connection
+        finally:
+            release(conn, r)
+
+    def coalesced(self, body):
+        """Forward a non-streaming POST, sharing one upstream call between identical bodies."""
+        key = (self.path, hashlib.sha1(body).digest())
+        with _inflight_lock:
+            fut = _inflight.get(key)
+            leader = fut is None
+            if leader:
+                fut = _inflight[key] = Future()
+        if leader:
+            try:
+                conn, r = upstream('POST', self.path, body, {'Content-Type': 'application/json'})
+                try:
+                    fut.set_result((r.status, r.getheaders(), r.read()))
+                finally:
+                    release(conn, r)
+            except Exception as e:
+                fut.set_exception(e)
+            finally:
+                with _inflight_lock:
+                    del _inflight[key]
+        else:
+            print("[proxy] Joined identical in-flight request")
+        return fut.result()
+
+    def body_chunks(self, length):
+        """Yield the request body in 64K pieces without holding it all in memory."""
+        while length > 0:
+            chunk = self.rfile.read(min(length, 65536))
+            if not chunk:
+                raise ConnectionError("client closed before sending the whole body")
+            length -= len(chunk)
+            yield chunk
+
+    def do_POST(self):
+        length = int(self.headers['Content-Length'])
+        if length > MAX_BUFFERED_BODY:
+            # no tools to inject into something this size; a generator body can't
+            # be replayed, so skip the stale keep-alive retry by starting fresh
+            try:
+                conn, r = upstream('POST', self.path, self.body_chunks(length), {
+                    'Content-Type': self.headers.get('Content-Type', 'application/json'),
+                    'Content-Length': str(length)}, fresh=True)
+            except (http.client.HTTPException, OSError) as e:
+                self.send_error(502, f"Ollama unreachable: {e}")
+                return
+            self.relay(conn, r)
+            return
+
+        body = self.rfile.read(length)
+        if self.path in TOOL_PATHS:
+            injected = inject_tools(body)
+            if injected is not None:
+                body = injected
+                print(f"[proxy] Injected {len(TOOLS)} tools")
+        if self.path in TOOL_PATHS and STREAM_OFF.search(body):
+            try:
+                status, headers, data = self.coalesced(body)
+            except (http.client.HTTPException, OSError) as e:
+                self.send_error(502, f"Ollama unreachable: {e}")
+                return
+            try:
+                self.start_response(status, headers)
                 self.wfile.write(data)
-        except Exception as e:
-            self.send_error(500, str(e))
+            except OSError:
+                pass  # client hung up; nothing left to tell it
+            return
+        try:
+            conn, r = upstream('POST', self.path, body, {'Content-Type': 'application/json'})
+        except (http.client.HTTPException, OSError) as e:
+            self.send_error(502, f"Ollama unreachable: {e}")
+            return
+        self.relay(conn, r)
 
     def do_GET(self):
-        with urllib.request.urlopen(OLLAMA + self.path) as r:
-            self.send_response(200)
-            self.send_header('Content-Type', r.headers.get('Content-Type', 'application/json'))
-            self.end_headers()
-            self.wfile.write(r.read())
+        try:
+            conn, r = upstream('GET', self.path)
+        except (http.client.HTTPException, OSError) as e:
+            self.send_error(502, f"Ollama unreachable: {e}")
+            return
+        self.relay(conn, r)
 
     def log_message(self, fmt, *args): print(f"[proxy] {args[0]}")
 
 if __name__ == '__main__':
     print("Tool proxy on :11435 -> Ollama :11434")
-    HTTPServer(('', 11435), Proxy).serve_forever()
+    ThreadingHTTPServer(('', 11435), Proxy).serve_forever()
@@ -5,10 +5,189 @@ version: 0.1.0
 description: Read files from the mounted /app/code directory
 """
 
+import io
+import itertools
+import json
 import os
+import shutil
+import stat
+import subprocess
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pydantic import BaseModel, Field
 from typing import Optional, Callable, Awaitable, Any
 
+try:
+    import pathspec
+except ImportError:  # optional - without it only hidden and SKIP_DIRS directories are pruned
+    pathspec = None
+
+RG = shutil.which("rg")
+RG_TIMEOUT = 10  # seconds; rg is killed after this and its matches so far are kept
+GREP_WORKERS = 8  # files read ahead in parallel by the Python grep fallback
+# never worth opening for a text grep
+BINARY_EXTS = frozenset({
+    ".png", ".jpg", ".jpeg", ".gif", ".ico", ".pdf", ".zip", ".gz", ".tar",
+    ".pyc", ".so", ".o", ".a", ".dylib", ".exe", ".bin", ".woff", ".woff2",
+})
+
+# build output and dependency trees that are never worth searching
+SKIP_DIRS = frozenset({"node_modules", "__pycache__", "dist", "build", "target", "venv"})
+
+
+def _run_rg(cmd: list, limit: int) -> Optional[tuple]:
+    """Run an `rg --json` search, stopping once `limit` matches are in.
+
+    Returns ([(path, line_num, line)], files_searched) or None if rg can't run.
+    files_searched is None when rg was stopped early, at the limit or after
+    RG_TIMEOUT, before it reported its summary.
+    """
+    try:
+        p = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                             encoding="utf-8", errors="replace")
+    except OSError:
+        return None
+    timer = threading.Timer(RG_TIMEOUT, p.kill)
+    timer.start()
+    matches, files_searched = [], None
+    try:
+        for line in p.stdout:
+            try:
+                msg = json.loads(line)
+            except ValueError:  # cut short by the kill
+                break
+            data = msg["data"]
+            if msg["type"] == "match" and "text" in data["path"] and "text" in data["lines"]:
+                matches.append((data["path"]["text"], data["line_number"], data["lines"]["text"]))
+                if len(matches) >= limit:
+                    break
+            elif msg["type"] == "summary":
+                files_searched = data["stats"]["searches"]
+    finally:
+        timer.cancel()
+        p.kill()  # no-op once rg has exited
+        p.stdout.close()
+        returncode = p.wait()
+    # exit 1 is "no matches"; 2 is an error, but rg still reports what it could search
+    if returncode > 1 and not matches:
+        return None
+    return matches, files_searched
+
+
+def _load_gitignore(path: str):
+    """Compile a .gitignore with pathspec, or None if it can't be used."""
+    if pathspec is None:
+        return None
+    try:
+        with open(path, encoding='utf-8', errors='ignore') as f:
+            return pathspec.PathSpec.from_lines('gitwildmatch', f)
+    except OSError:
+        return None
+
+
+def _ignored(path: str, is_dir: bool, ignores: tuple) -> bool:
+    for prefix_len, spec in ignores:
+        rel = path[prefix_len:]
+        if spec.match_file(rel + '/' if is_dir else rel):
+            return True
+    return False
+
+
+def _walk_files(top: str, ignores: tuple = ()):
+    """Yield a DirEntry for every file under top worth searching.
+
+    Same order as os.walk (a directory's files before its subdirectories),
+    but names and types come straight from scandir with no per-file stat.
+    Hidden and SKIP_DIRS directories are pruned, and so is anything matched
+    by a .gitignore on the way down when pathspec is installed.
+    """
+    try:
+        with os.scandir(top) as it:
+            entries = list(it)
+    except OSError:
+        return
+    if any(e.name == '.gitignore' for e in entries):
+        spec = _load_gitignore(os.path.join(top, '.gitignore'))
+        if spec is not None:
+            ignores += ((len(os.path.join(top, '')), spec),)
+
+    subdirs = []
+    for entry in entries:
+        if entry.is_dir():
+            # like os.walk, don't follow symlinked directories
+            if (entry.name.startswith('.') or entry.name in SKIP_DIRS or entry.is_symlink()
+                    or _ignored(entry.path, True, ignores)):
+                continue
+            subdirs.append(entry.path)
+        elif not _ignored(entry.path, False, ignores):
+            yield entry
+    for path in subdirs:
+        yield from _walk_files(path, ignores)
+
+
+def _grep_lines(data: bytes, needle: str):
+    """Yield (line_num, line) for lines of data containing needle, case-insensitively."""
+    if not (needle and needle.isascii()):
+        # bytes.lower() only folds ASCII, so search the decoded text line by line;
+        # an empty needle matches every line, which the line loop already does
+        for line_num, line in enumerate(io.StringIO(data.decode('utf-8', 'ignore')), 1):
+            if needle in line.lower():
+                yield line_num, line
+        return
+
+    # one find over the whole buffer, counting newlines only up to each hit
+    hay = data.lower()
+    target = needle.encode()
+    line_num, counted = 1, 0
+    pos = hay.find(target)
+    while pos != -1:
+        start = hay.rfind(b'\n', 0, pos) + 1
+        end = hay.find(b'\n', pos)
+        if end == -1:
+            end = len(hay)
+        line_num += hay.count(b'\n', counted, start)
+        counted = start
+        yield line_num, data[start:end].decode('utf-8', 'ignore')
+        pos = hay.find(target, end + 1)
+
+
+def _scan_file(entry, needle: str) -> Optional[list]:
+    """Grep one file; None if it was skipped as too large, binary or unreadable."""
+    try:
+        if entry.stat().st_size > 50000:
+            return None
+        with open(entry.path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    # a NUL near the start means binary, same heuristic as git/grep
+    if data.find(b'\x00', 0, 4096) != -1:
+        return None
+    return list(itertools.islice(_grep_lines(data, needle), 30))
+
+
+def _scan_files(entries, needle: str):
+    """Yield (path, hits) in walk order, reading a few files ahead on worker threads.
+
+    The threads only overlap the file reads - the search itself holds the GIL -
+    which is what pays off on a slow bind-mounted /app/code.
+    """
+    pending = deque()
+    with ThreadPoolExecutor(GREP_WORKERS) as pool:
+        try:
+            for entry in entries:
+                pending.append((entry.path, pool.submit(_scan_file, entry, needle)))
+                if len(pending) >= GREP_WORKERS * 2:
+                    path, fut = pending.popleft()
+                    yield path, fut.result()
+            while pending:
+                path, fut = pending.popleft()
+                yield path, fut.result()
+        finally:
+            # caller stopped early - drop the read-ahead instead of finishing it
+            for _, fut in pending:
+                fut.cancel()
 
 class Pipe:
     """
@@ -28,6 +207,31 @@ class Pipe:
 
     def __init__(self):
         self.valves = self.Valves()
+        self._base_real = (None, "")  # (base_path, realpath) - valves can change at runtime
+        self._dispatch = {
+            "list": self._list_directory,
+            "read": self._read_file,
+            "search": self._search_files,
+            "grep": self._grep_in_files,
+        }
+
+    def _inside_base(self, real_path: str) -> bool:
+        """Check a resolved path is base_path itself or somewhere below it."""
+        base = self.valves.base_path
+        if self._base_real[0] != base:
+            self._base_real = (base, os.path.realpath(base))
+        base_real = self._base_real[1]
+        # compare against base + separator so /app/code2 doesn't pass as /app/code
+        return real_path == base_real or real_path.startswith(os.path.join(base_real, ""))
+
+    def _resolve(self, path: str) -> tuple:
+        """Resolve a user path to (real_path, allowed).
+
+        Resolved fresh on every call - a symlink created after a lookup must not
+        inherit an earlier access decision. Only the base realpath is memoized.
+        """
+        real_path = os.path.realpath(os.path.join(self.valves.base_path, path))
+        return real_path, self._inside_base(real_path)
 
     def pipe(self, body: dict, __user__: Optional[dict] = None) -> str:
         """Process the input and execute file operations."""
@@ -38,19 +242,10 @@ class Pipe:
         user_message = messages[-1].get("content", "").strip()
 
         # Parse command format: command:argument
-        if ":" in user_message:
-            cmd, arg = user_message.split(":", 1)
-            cmd = cmd.lower().strip()
-            arg = arg.strip()
-
-            if cmd == "list":
-                return self._list_directory(arg)
-            elif cmd == "read":
-                return self._read_file(arg)
-            elif cmd == "search":
-                return self._search_files(arg)
-            elif cmd == "grep":
-                return self._grep_in_files(arg)
+        cmd, sep, arg = user_message.partition(":")
+        handler = self._dispatch.get(cmd.strip().lower()) if sep else None
+        if handler:
+            return handler(arg.strip())
 
         return f"""Code Directory Reader - Commands:
 - list:<path> - List directory contents (e.g., list: or list:clood)
@@ -61,27 +256,27 @@ class Pipe:
 Your input: {user_message}"""
 
     def _list_directory(self, path: str = "") -> str:
-        full_path = os.path.join(self.valves.base_path, path)
-        real_path = os.path.realpath(full_path)
-
-        if not real_path.startswith(os.path.realpath(self.valves.base_path)):
+        real_path, allowed = self._resolve(path)
+        if not allowed:
             return "Error: Access denied - path outside allowed directory"
 
-        if not os.path.exists(real_path):
+        try:
+            st = os.stat(real_path)
+        except OSError:
             return f"Error: Path does not exist: {path}"
 
-        if not os.path.isdir(real_path):
+        if not stat.S_ISDIR(st.st_mode):
             return f"Error: Not a directory: {path}"
 
         try:
             entries = []
-            for entry in sorted(os.listdir(real_path)):
-                entry_path = os.path.join(real_path, entry)
-                if os.path.isdir(entry_path):
-                    entries.append(f"[DIR]  {entry}/")
-                else:
-                    size = os.path.getsize(entry_path)
-                    entries.append(f"[FILE] {entry} ({size} bytes)")
+            with os.scandir(real_path) as it:
+                # DirEntry caches the type and stat, so no per-entry path lookups
+                for entry in sorted(it, key=lambda e: e.name):
+                    if entry.is_dir():
+                        entries.append(f"[DIR]  {entry.name}/")
+                    else:
+                        entries.append(f"[FILE] {entry.name} ({entry.stat().st_size} bytes)")
 
             if not entries:
                 return f"Directory '{path or '/'}' is empty"
@@ -91,19 +286,19 @@ Your input: {user_message}"""
             return f"Error listing directory: {str(e)}"
 
     def _read_file(self, path: str) -> str:
-        full_path = os.path.join(self.valves.base_path, path)
-        real_path = os.path.realpath(full_path)
-
-        if not real_path.startswith(os.path.realpath(self.valves.base_path)):
+        real_path, allowed = self._resolve(path)
+        if not allowed:
             return "Error: Access denied - path outside allowed directory"
 
-        if not os.path.exists(real_path):
+        try:
+            st = os.stat(real_path)
+        except OSError:
             return f"Error: File does not exist: {path}"
 
-        if os.path.isdir(real_path):
+        if stat.S_ISDIR(st.st_mode):
             return f"Error: Path is a directory, not a file: {path}"
 
-        file_size = os.path.getsize(real_path)
+        file_size = st.st_size
         if file_size > self.valves.max_file_size:
             return f"Error: File too large ({file_size} bytes). Max: {self.valves.max_file_size}"
 
@@ -117,17 +312,12 @@ Your input: {user_message}"""
     def _search_files(self, pattern: str) -> str:
         matches = []
         try:
-            for root, dirs, files in os.walk(self.valves.base_path):
-                dirs[:] = [d for d in dirs if not d.startswith('.')]
-                for filename in files:
-                    if pattern.lower() in filename.lower():
-                        rel_path = os.path.relpath(
-                            os.path.join(root, filename),
-                            self.valves.base_path
-                        )
-                        matches.append(rel_path)
-                        if len(matches) >= 50:
-                            return f"Files matching '{pattern}':\n" + "\n".join(matches) + "\n... (truncated)"
+            needle = pattern.lower()
+            for entry in _walk_files(self.valves.base_path):
+                if needle in entry.name.lower():
+                    matches.append(os.path.relpath(entry.path, self.valves.base_path))
+                    if len(matches) >= 50:
+                        return f"Files matching '{pattern}':\n" + "\n".join(matches) + "\n... (truncated)"
 
             if not matches:
                 return f"No files found matching '{pattern}'"
@@ -135,25 +325,43 @@ Your input: {user_message}"""
         except Exception as e:
             return f"Error searching: {str(e)}"
 
+    def _rg_grep(self, search_text: str, limit: int) -> Optional[tuple]:
+        """Search with ripgrep; see _run_rg for the result."""
+        if not RG:
+            return None
+        # Same files as _walk_files (dotfiles yes, hidden directories no), in a stable order
+        cmd = [RG, "--json", "-i", "-F", "--no-require-git", "--max-count", str(limit), "--max-filesize", "50000",
+               "--hidden", "-g", "!.*/", "--sort", "path"]
+        cmd += [arg for d in sorted(SKIP_DIRS) for arg in ("-g", f"!{d}/")]
+        return _run_rg(cmd + ["--", search_text, self.valves.base_path], limit)
+
     def _grep_in_files(self, search_text: str) -> str:
         results = []
+        found = self._rg_grep(search_text, 30)
+        if found is not None:
+            matches, files_searched = found
+            for file_path, line_num, line in matches:
+                rel_path = os.path.relpath(file_path, self.valves.base_path)
+                results.append(f"{rel_path}:{line_num}: {line.strip()[:80]}")
+            timed_out = files_searched is None and len(matches) < 30
+            if not results:
+                return f"No matches found for '{search_text}'" + (f" (timed out after {RG_TIMEOUT}s)" if timed_out else "")
+            if timed_out:
+                results.append(f"... (timed out after {RG_TIMEOUT}s)")
+            return f"Found {len(matches)} matches:\n" + "\n".join(results)
+
+        needle = search_text.lower()
         try:
-            for root, dirs, files in os.walk(self.valves.base_path):
-                dirs[:] = [d for d in dirs if not d.startswith('.')]
-                for filename in files:
-                    file_path = os.path.join(root, filename)
-                    try:
-                        if os.path.getsize(file_path) > 50000:
-                            continue
-                        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            for line_num, line in enumerate(f, 1):
-                                if search_text.lower() in line.lower():
-                                    rel_path = os.path.relpath(file_path, self.valves.base_path)
-                                    results.append(f"{rel_path}:{line_num}: {line.strip()[:80]}")
-                                    if len(results) >= 30:
-                                        return f"Found {len(results)} matches:\n" + "\n".join(results)
-                    except:
-                        continue
+            entries = (
+                e for e in _walk_files(self.valves.base_path)
+                if os.path.splitext(e.name)[1].lower() not in BINARY_EXTS
+            )
+            for file_path, hits in _scan_files(entries, needle):
+                for line_num, line in hits or ():
+                    rel_path = os.path.relpath(file_path, self.valves.base_path)
+                    results.append(f"{rel_path}:{line_num}: {line.strip()[:80]}")
+                    if len(results) >= 30:
+                        return f"Found {len(results)} matches:\n" + "\n".join(results)
 
             if not results:
                 return f"No matches found for '{search_text}'"